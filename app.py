@@ -1,620 +1,2640 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString, Tag
+import hashlib
+import importlib
 import json
+import os
+import re
+import secrets
+import shutil
+import sqlite3
+import sys
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+import argparse
+import asyncio
+import contextvars
+import csv
+import functools
+import random
+import glob
+import gzip
 import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import aiohttp
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class RatingAgencyAlertSystem:
-    def __init__(self):
-        self.setup_selenium()
-        self.alerts = []
+# Maximum number of headless Chrome instances kept alive at once
+DEFAULT_MAX_DRIVERS = 4
+
+# A driver is replaced with a fresh one after this many checkouts, or once its
+# Chrome process tree grows past this resident size
+DRIVER_MAX_USES = 50
+DRIVER_MAX_RSS_MB = 1024
+
+# Local endpoint of the long-lived browser daemon; the auth key comes from the
+# environment, or else from a random per-user key file only its owner can read
+BROWSER_DAEMON_ADDRESS = '127.0.0.1:47311'
+BROWSER_DAEMON_KEY_ENV = 'RATING_ALERTS_DAEMON_KEY'
+BROWSER_DAEMON_KEY_PATH = os.path.join(os.path.expanduser('~'), '.rating_alerts_daemon_key')
+
+# Lean browser mode: Chrome switches for features a DOM-only scraper never uses
+LEAN_CHROME_ARGUMENTS = [
+    '--blink-settings=imagesEnabled=false',
+    '--autoplay-policy=user-gesture-required',
+    '--mute-audio',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-notifications',
+    '--no-first-run',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+]
+
+LEAN_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+}
+
+# URL patterns the lean browser refuses to fetch: images, media, fonts and
+# known analytics/ad hosts. Stylesheets still load since waits check visibility
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*',
+    '*scorecardresearch.com*', '*quantserve.com*', '*taboola.com*', '*outbrain.com*',
+    '*moengage.com*', '*webengage.com*', '*newrelic.com*', '*nr-data.net*',
+]
+
+def create_chrome_driver(lean=True):
+    """Create a headless Chrome WebDriver, lean unless told otherwise, or None if Chrome cannot be started"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    if lean:
+        # Hand the page over once the DOM is parsed instead of waiting for every subresource
+        chrome_options.page_load_strategy = 'eager'
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option('prefs', LEAN_CHROME_PREFS)
+    
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+    except Exception as e:
+        logger.error(f"Failed to setup Selenium: {e}")
+        return None
+    
+    if lean:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        except Exception as e:
+            logger.warning(f"Could not install the request blocklist: {e}")
+    return driver
+
+def process_tree_rss(root_pid):
+    """Total VmRSS in bytes of a process and all of its descendants (0 where /proc is unavailable)"""
+    if not os.path.isdir('/proc'):
+        return 0
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+class DriverPool:
+    """Bounded pool of WebDriver instances shared by scraper threads"""
+    def __init__(self, factory, max_size=DEFAULT_MAX_DRIVERS, max_uses=DRIVER_MAX_USES, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self, timeout=None):
+        """Check out an idle driver, creating one while the pool is below its bound"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
         
-    def setup_selenium(self):
-        """Setup Selenium WebDriver with Chrome options"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
+        with self._lock:
+            can_create = not self._closed and len(self._drivers) < self.max_size
+            if can_create:
+                # Reserve the slot so concurrent callers respect the bound
+                self._drivers.append(None)
         
+        if not can_create:
+            return self._idle.get(timeout=timeout)
+        
+        driver = self.factory()
+        with self._lock:
+            self._drivers.remove(None)
+            if driver:
+                self._drivers.append(driver)
+        return driver
+
+    def release(self, driver):
+        """Return a driver to the pool, retiring it instead if it is worn out or dead"""
+        if driver is None:
+            return
+        if self._closed:
+            self._quit(driver)
+            return
+        
+        uses = self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        reason = None
+        # A dead Chrome has no resident memory, so it has to be caught before the RSS check
+        if not self.driver_alive(driver):
+            reason = "its browser stopped responding"
+        elif self.max_uses and uses >= self.max_uses:
+            reason = f"{uses} uses"
+        elif self.max_rss_mb:
+            rss_mb = self.driver_rss(driver) / 2**20
+            if rss_mb > self.max_rss_mb:
+                reason = f"{rss_mb:.0f} MiB resident"
+        if reason:
+            self.retire(driver, reason)
+            return
+        self._idle.put(driver)
+
+    def driver_alive(self, driver):
+        """Whether a driver's chromedriver is still running and its browser still answers"""
+        service = getattr(driver, 'service', None)
+        if service is None:
+            return True
+        process = getattr(service, 'process', None)
+        if process is not None and process.poll() is not None:
+            return False
+        if not service.is_connectable():
+            return False
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 20)
-        except Exception as e:
-            logger.error(f"Failed to setup Selenium: {e}")
-            self.driver = None
+            driver.current_window_handle
+        except WebDriverException:
+            return False
+        return True
 
-    def get_current_date_str(self):
-        """Get current date in various formats"""
-        today = datetime.now()
-        return {
-            'dd-mm-yyyy': today.strftime('%d-%m-%Y'),
-            'yyyy-mm-dd': today.strftime('%Y-%m-%d'),
-            'dd/mm/yyyy': today.strftime('%d/%m/%Y'),
-            'mm/dd/yyyy': today.strftime('%m/%d/%Y'),
-            'dd-mmm-yyyy': today.strftime('%d-%b-%Y'),
-            'dd mmm yyyy': today.strftime('%d %b %Y'),
-        }
+    def driver_rss(self, driver):
+        """Resident memory in bytes of a driver's chromedriver and Chrome processes"""
+        try:
+            return process_tree_rss(driver.service.process.pid)
+        except AttributeError:
+            return 0
+
+    def retire(self, driver, reason):
+        """Quit a driver and free its slot so the next acquire starts a fresh one"""
+        logger.info(f"Restarting WebDriver after {reason}")
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._uses.pop(id(driver), None)
+        self._quit(driver)
 
-    def scrape_icra_ratings(self):
-        """Scrape ICRA ratings with date-wise updates and pagination"""
-        logger.info("Scraping ICRA ratings...")
+    @contextmanager
+    def checkout(self, timeout=None):
+        """Context manager that acquires a driver and always releases it"""
+        driver = self.acquire(timeout=timeout)
         try:
-            if not self.driver:
-                return []
-            
-            # Navigate to ICRA ratings page
-            self.driver.get("https://www.icra.in/Rating/RatingList.aspx")
-            
-            # Wait for page to load
-            time.sleep(3)
-            
-            # Set current date filter if available
+            yield driver
+        finally:
+            self.release(driver)
+
+    def prewarm(self, count=1):
+        """Start drivers ahead of time so the first scraper does not pay Chrome startup"""
+        drivers = [self.acquire() for _ in range(min(count, self.max_size))]
+        for driver in drivers:
+            self.release(driver)
+        return sum(1 for driver in drivers if driver)
+
+    def close(self):
+        """Quit every driver created by the pool"""
+        with self._lock:
+            self._closed = True
+            drivers = [driver for driver in self._drivers if driver]
+            self._drivers = []
+            self._uses = {}
+        while True:
             try:
-                date_input = self.driver.find_element(By.ID, "txtFromDate")
-                date_input.clear()
-                date_input.send_keys(self.get_current_date_str()['dd/mm/yyyy'])
-                
-                to_date_input = self.driver.find_element(By.ID, "txtToDate")
-                to_date_input.clear()
-                to_date_input.send_keys(self.get_current_date_str()['dd/mm/yyyy'])
-                
-                # Click search/filter button
-                search_btn = self.driver.find_element(By.ID, "btnSearch")
-                search_btn.click()
-                time.sleep(3)
-            except NoSuchElementException:
-                logger.info("Date filter not found, proceeding with default view")
-            
-            alerts = []
-            page_num = 1
-            
-            while True:
-                logger.info(f"Processing ICRA page {page_num}")
-                
-                # Extract ratings from current page
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Look for rating table/list
-                rating_rows = soup.find_all('tr', class_='gridrow') or soup.find_all('div', class_='rating-item')
-                
-                for row in rating_rows:
-                    try:
-                        # Extract rating information
-                        company_name = self.extract_text_from_element(row, ['company', 'entity', 'name'])
-                        rating_date = self.extract_text_from_element(row, ['date', 'rated-on'])
-                        rating_action = self.extract_text_from_element(row, ['action', 'rating', 'grade'])
-                        
-                        if company_name and self.is_today_date(rating_date):
-                            alerts.append({
-                                'agency': 'ICRA',
-                                'company': company_name,
-                                'date': rating_date,
-                                'action': rating_action,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                    except Exception as e:
-                        logger.warning(f"Error extracting ICRA rating: {e}")
-                
-                # Check for next page
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for driver in drivers:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting WebDriver: {e}")
+
+# Browser-like headers for the HTTP fast path; some exchanges reject bare clients
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept': 'text/html,application/json;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+HTTP_TIMEOUT = 15
+
+ACUITE_LIVE_RATINGS_URL = "https://connect.acuite.in/liveratings"
+SEBI_LISTING_URL = "https://www.sebi.gov.in/sebiweb/home/HomeAction.do?doListing=yes&sid=1&ssid=1&smid=1"
+SEBI_LISTING_AJAX_URL = "https://www.sebi.gov.in/sebiweb/ajax/home/getnewslistinfo.jsp"
+BSE_ANNOUNCEMENTS_API_URL = "https://api.bseindia.com/BseIndiaAPI/api/AnnSubCategoryGetData/w"
+BSE_API_HEADERS = {'Referer': "https://www.bseindia.com/", 'Origin': "https://www.bseindia.com"}
+NSE_ANNOUNCEMENTS_PAGE_URL = "https://www.nseindia.com/companies-listing/corporate-filings-announcements"
+NSE_ANNOUNCEMENTS_API_URL = "https://www.nseindia.com/api/corporate-announcements"
+
+# Segment name -> strType of the BSE announcements API
+BSE_API_SEGMENTS = {'Equity': 'C', 'Debt': 'D'}
+
+# Segment name -> index of the NSE corporate announcements API
+NSE_API_SEGMENTS = {'Equity': 'equities', 'Debt': 'debt'}
+
+# Concurrent requests allowed per host by the async engine
+HOST_CONCURRENCY = {
+    'api.bseindia.com': 4,
+    'www.nseindia.com': 2,
+    'www.sebi.gov.in': 2,
+    'connect.acuite.in': 2,
+}
+DEFAULT_HOST_CONCURRENCY = 2
+
+# SEBI pages requested together by the async engine before checking for "Next"
+SEBI_PAGE_WINDOW = 3
+
+# Parser used for every page; lxml builds trees several times faster than html.parser
+HTML_PARSER = 'lxml'
+
+# Only the elements each scraper reads are built into the tree
+PARSE_STRAINERS = {
+    'ICRA': SoupStrainer(['tr', 'div'], class_=['gridrow', 'rating-item']),
+    'CareEdge': SoupStrainer('div', class_=['rating-item', 'rating-card', 'recent-rating-item']),
+    'Acuite': SoupStrainer('table'),
+    'CRISIL': SoupStrainer('div', class_=['rating-item', 'rating-card', 'announcement-item']),
+    'BSE': SoupStrainer('table'),
+    'NSE': SoupStrainer('table'),
+    'NSE cards': SoupStrainer('div', class_='announcement-item'),
+    # Anchors are kept so parse_sebi_html can see the "Next" link
+    'SEBI': SoupStrainer(['table', 'a']),
+}
+
+def parse_html(html, target=None):
+    """Parse html with lxml, building only the elements the target scraper reads"""
+    return BeautifulSoup(html, HTML_PARSER, parse_only=PARSE_STRAINERS.get(target))
+
+# Formats tried, in order, when parsing a date token; day-first wins over month-first
+DATE_PARSE_FORMATS = [
+    '%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%b-%Y', '%d %b %Y', '%d %B %Y',
+    '%d-%B-%Y', '%b %d %Y', '%B %d %Y',
+]
+DATE_TOKEN = re.compile(
+    r'\d{4}-\d{1,2}-\d{1,2}'
+    r'|\d{1,2}[-/]\d{1,2}[-/]\d{4}'
+    r'|\d{1,2}[- ][A-Za-z]{3,9}[- ]\d{4}'
+    r'|[A-Za-z]{3,9} \d{1,2} \d{4}'
+)
+
+class DateMatcher:
+    """Matches row dates against a target date or window; built once per sweep"""
+    def __init__(self, target_date=None, window_days=0):
+        if isinstance(target_date, datetime):
+            target_date = target_date.date()
+        self.end = target_date or date.today()
+        self.start = self.end - timedelta(days=window_days)
+        self._matches = {}
+        self._parsed = {}
+
+    def matches(self, date_text):
+        """Check if the date parsed from date_text is in the window"""
+        if not date_text:
+            return False
+        matched = self._matches.get(date_text)
+        if matched is None:
+            # Matching on the parsed date keeps an ambiguous "03/04/2026" on
+            # the same day the alert is stored, keyed and paginated under
+            matched = self._matches[date_text] = self.in_window(self.parse(date_text))
+        return matched
+
+    def parse(self, date_text):
+        """Parse the first date in date_text into a date, or None"""
+        if not date_text:
+            return None
+        if date_text in self._parsed:
+            return self._parsed[date_text]
+        
+        parsed = None
+        for token in DATE_TOKEN.findall(date_text.replace(',', '')):
+            for fmt in DATE_PARSE_FORMATS:
                 try:
-                    next_button = self.driver.find_element(By.XPATH, "//a[contains(text(), 'Next')] | //input[@value='Next']")
-                    if next_button.is_enabled():
-                        next_button.click()
-                        time.sleep(3)
-                        page_num += 1
-                    else:
-                        break
-                except NoSuchElementException:
+                    parsed = datetime.strptime(token, fmt).date()
                     break
-            
-            logger.info(f"Found {len(alerts)} ICRA alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping ICRA: {e}")
-            return []
+                except ValueError:
+                    continue
+            if parsed:
+                break
+        self._parsed[date_text] = parsed
+        return parsed
+
+    def in_window(self, day):
+        """Check if a parsed date falls inside the window"""
+        return day is not None and self.start <= day <= self.end
+
+# Row order of the paginated listings; sorted sources stop paging once a
+# whole page falls outside the date window
+SOURCE_SORT_ORDER = {
+    'ICRA': 'desc',
+    'CareEdge': 'desc',
+    'Acuite': 'desc',
+    'CRISIL': 'desc',
+    'BSE': 'desc',
+    'NSE': 'desc',
+    'SEBI': 'desc',
+}
+
+# Persistent per-source state (watermarks) carried between runs
+STATE_PATH = 'scraper_state.json'
+
+# Content hashed per source so an unchanged poll skips parsing altogether
+CONTENT_FRAGMENTS = {
+    'CareEdge': '.recent-ratings',
+    'CRISIL': 'div.rating-item, div.rating-card, div.announcement-item',
+}
+
+# Embedded database every sweep's alerts are stored in
+ALERT_DB_PATH = 'rating_alerts.db'
+
+# Rows written per executemany batch
+ALERT_INSERT_BATCH = 500
+
+# Directory of daily newline-delimited JSON segments alerts are streamed to
+ALERT_STREAM_DIR = 'alert_stream'
 
-    def scrape_careedge_ratings(self):
-        """Scrape CareEdge ratings with scrolling through recent ratings"""
-        logger.info("Scraping CareEdge ratings...")
+# Parquet dataset of every sweep's alerts, hive-partitioned by date and agency
+ARCHIVE_DIR = 'alert_archive'
+
+ARCHIVE_SCHEMA = pa.schema([
+    ('date', pa.date32()),
+    ('agency', pa.string()),
+    ('segment', pa.string()),
+    ('company', pa.string()),
+    ('action', pa.string()),
+    ('rating', pa.string()),
+    ('date_text', pa.string()),
+    ('timestamp', pa.timestamp('us')),
+])
+
+ARCHIVE_PARTITIONING = ds.partitioning(
+    pa.schema([('date', pa.date32()), ('agency', pa.string())]),
+    flavor='hive',
+)
+
+# Rating symbols as published by Indian agencies, e.g. "CRISIL AA+/Stable",
+# "[ICRA]A1+", "CARE BBB-; Negative" or a bare "AA-" in an announcement title
+RATING_PATTERN = re.compile(
+    r'(?:\b(?:CRISIL|CARE|IND|ACUITE|BWR|IVR)\s*|\[ICRA\]\s*)(A[1-4]|AAA|AA|A|BBB|BB|B|C|D)([+-]?)(?![A-Za-z0-9])'
+    r'|(?<![A-Za-z0-9\[])(A[1-4]|AAA|AA|BBB|BB)([+-]?)(?![A-Za-z0-9])'
+)
+
+def normalize_rating(text):
+    """Pull the first rating symbol out of an action/title, without the agency prefix (e.g. 'AA+')"""
+    match = RATING_PATTERN.search(text or '')
+    if not match:
+        return None
+    grade, modifier = match.group(1, 2) if match.group(1) else match.group(3, 4)
+    return grade + modifier
+
+def split_agency(agency):
+    """Split an alert agency such as 'BSE (Debt)' into ('BSE', 'Debt')"""
+    match = re.match(r'^(.*?)\s*\((.+)\)$', agency)
+    if match:
+        return match.group(1), match.group(2)
+    return agency, ''
+
+def alert_key(alert):
+    """Stable key identifying an alert within its agency and segment"""
+    raw = '\x1f'.join([alert['agency'], alert['company'], alert['date'], alert['action']])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+class Alert:
+    """One scraped alert, readable like the dict it replaces; agencies are interned and one timestamp string is shared per sweep"""
+    __slots__ = ('agency', 'company', 'date', 'action', 'timestamp', 'scrip_code', 'symbol', 'isin', 'entity_id')
+
+    def __init__(self, agency, company, date, action, timestamp, **extra):
+        # 'BSE (Debt)' and friends repeat on every row, so all of them share one string
+        self.agency = sys.intern(agency)
+        self.company = company
+        self.date = date
+        self.action = action
+        self.timestamp = timestamp
+        for name, value in extra.items():
+            self[name] = value
+
+    def __getitem__(self, name):
         try:
-            if not self.driver:
-                return []
-            
-            self.driver.get("https://www.careratings.com/")
-            time.sleep(3)
-            
-            alerts = []
-            
-            # Look for "Recent Ratings" section
-            try:
-                recent_ratings_section = self.wait.until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "recent-ratings"))
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in self.__slots__ and hasattr(self, name)
+
+    def __eq__(self, other):
+        if isinstance(other, (Alert, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Alert({self.to_dict()!r})"
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def keys(self):
+        """Names of the fields that are set, in dict order"""
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def to_dict(self):
+        """The alert as a plain dict, e.g. for json.dumps(alerts, default=Alert.to_dict)"""
+        return {name: getattr(self, name) for name in self.keys()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an alert from to_dict() output or a JSON line"""
+        return cls(**data)
+
+# Legal-form words dropped when comparing company names across sources
+COMPANY_SUFFIXES = {'the', 'limited', 'ltd', 'private', 'pvt', 'company', 'co', 'inc', 'corp', 'corporation'}
+
+# Coarse action classes that survive differences in wording between agencies and exchanges;
+# anything unmatched (assigned, reaffirmed, a bare "Credit Rating" title) is GENERIC_ACTION
+ACTION_CLASSES = [
+    ('upgrade', re.compile(r'upgrad', re.I)),
+    ('downgrade', re.compile(r'downgrad', re.I)),
+    ('withdrawn', re.compile(r'withdr[ae]w', re.I)),
+    ('watch', re.compile(r'watch|developing implications', re.I)),
+]
+GENERIC_ACTION = 'rating'
+
+# Sources whose announcements disclose an agency's action rather than take one;
+# only their subjects mentioning a rating are matched to agency actions, the
+# rest (board meetings, record dates) are keyed on their own subject
+EXCHANGE_SOURCES = {'BSE', 'NSE'}
+RATING_SUBJECT = re.compile(r'\brating', re.I)
+NOTICE_PREFIX = 'notice:'
+
+def normalize_company(name):
+    """Casefolded company name without punctuation or legal-form words"""
+    words = re.sub(r'[^\w\s]', ' ', name.casefold().replace('&', ' and ')).split()
+    return ' '.join(word for word in words if word not in COMPANY_SUFFIXES)
+
+# Master list of NBFCs: id,name,aliases,isin,nse_symbol,bse_code with '|' between multiple values
+NBFC_ENTITIES_PATH = 'nbfc_entities.csv'
+
+# Fuzzy matching: character n-gram size, minimum Jaccard similarity, and the
+# posting-list length past which an n-gram (e.g. from "finance") is too common to block on
+ENTITY_NGRAM = 3
+ENTITY_MATCH_THRESHOLD = 0.6
+ENTITY_MAX_POSTING = 200
+
+def split_values(value):
+    """Non-empty '|'-separated values of a master file cell"""
+    return [part.strip() for part in (value or '').split('|') if part.strip()]
+
+def name_ngrams(normalized):
+    """Set of padded character n-grams of a normalized name"""
+    padded = f" {normalized} "
+    return {padded[i:i + ENTITY_NGRAM] for i in range(len(padded) - ENTITY_NGRAM + 1)}
+
+class EntityIndex:
+    """Resolves company names, ISINs and exchange symbols to canonical NBFC ids"""
+    def __init__(self):
+        self.labels = {}
+        self.names = {}
+        self.codes = {}
+        self.grams = {}
+        self.postings = {}
+        self._cache = {}
+
+    @classmethod
+    def from_csv(cls, path=NBFC_ENTITIES_PATH):
+        """Build the index from the entity master file"""
+        index = cls()
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                index.add(
+                    row['id'].strip(),
+                    row['name'].strip(),
+                    aliases=split_values(row.get('aliases')),
+                    codes=split_values(row.get('isin')) + split_values(row.get('nse_symbol')) + split_values(row.get('bse_code')),
                 )
-                
-                # Scroll through the recent ratings
-                last_height = self.driver.execute_script("return document.querySelector('.recent-ratings').scrollHeight")
-                
-                while True:
-                    # Scroll down in the recent ratings section
-                    self.driver.execute_script("document.querySelector('.recent-ratings').scrollTo(0, document.querySelector('.recent-ratings').scrollHeight);")
-                    time.sleep(2)
-                    
-                    # Calculate new scroll height and compare with last scroll height
-                    new_height = self.driver.execute_script("return document.querySelector('.recent-ratings').scrollHeight")
-                    if new_height == last_height:
-                        break
-                    last_height = new_height
-                
-                # Extract all ratings after scrolling
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                rating_items = soup.find_all('div', class_=['rating-item', 'rating-card', 'recent-rating-item'])
-                
-                for item in rating_items:
-                    try:
-                        company_name = self.extract_text_from_element(item, ['company', 'entity', 'name'])
-                        rating_date = self.extract_text_from_element(item, ['date', 'rated-on', 'timestamp'])
-                        rating_action = self.extract_text_from_element(item, ['action', 'rating', 'grade'])
-                        
-                        if company_name and self.is_today_date(rating_date):
-                            alerts.append({
-                                'agency': 'CareEdge',
-                                'company': company_name,
-                                'date': rating_date,
-                                'action': rating_action,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                    except Exception as e:
-                        logger.warning(f"Error extracting CareEdge rating: {e}")
-                        
-            except TimeoutException:
-                logger.warning("Recent ratings section not found on CareEdge")
-            
-            logger.info(f"Found {len(alerts)} CareEdge alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping CareEdge: {e}")
-            return []
+        return index
+
+    def add(self, entity_id, name, aliases=(), codes=()):
+        """Register an entity under its name, aliases and identifier codes"""
+        self.labels[entity_id] = name
+        for code in codes:
+            self.codes[code.upper()] = entity_id
+        for variant in [name, *aliases]:
+            normalized = normalize_company(variant)
+            if not normalized or normalized in self.names:
+                continue
+            self.names[normalized] = entity_id
+            grams = name_ngrams(normalized)
+            self.grams[normalized] = grams
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(normalized)
+        self._cache.clear()
+
+    def resolve(self, name, codes=()):
+        """Canonical id for a company string and any identifiers it came with, or None"""
+        for code in codes:
+            if code and code.upper() in self.codes:
+                return self.codes[code.upper()]
+        
+        normalized = normalize_company(name)
+        if normalized in self._cache:
+            return self._cache[normalized]
+        # Exchanges sometimes put the bare symbol where the name should be
+        entity_id = self.names.get(normalized) or self.codes.get(name.strip().upper()) or self.fuzzy_match(normalized)
+        self._cache[normalized] = entity_id
+        return entity_id
+
+    def fuzzy_match(self, normalized):
+        """Best n-gram Jaccard match, scoring only names blocked in by this name's rarest n-grams"""
+        if not normalized:
+            return None
+        grams = name_ngrams(normalized)
+        
+        # A name reaching the threshold shares at least ceil(t * size) n-grams,
+        # so it must share one of the (size - ceil(t * size) + 1) rarest ones;
+        # of those, n-grams common to most of the index are only used if nothing rarer is left
+        size = len(grams)
+        required = -int(-ENTITY_MATCH_THRESHOLD * size // 1)
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))[:size - required + 1]
+        selective = [gram for gram in rarest if len(self.postings.get(gram, ())) <= ENTITY_MAX_POSTING]
+        rarest = selective or rarest
+        low = size * ENTITY_MATCH_THRESHOLD
+        high = size / ENTITY_MATCH_THRESHOLD
+        candidates = set()
+        for gram in rarest:
+            for candidate in self.postings.get(gram, ()):
+                if low <= len(self.grams[candidate]) <= high:
+                    candidates.add(candidate)
+        
+        best, best_score = None, ENTITY_MATCH_THRESHOLD
+        for candidate in candidates:
+            other = self.grams[candidate]
+            overlap = len(grams & other)
+            score = overlap / (size + len(other) - overlap)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return self.names[best] if best else None
+
+    def label(self, entity_id):
+        """Display name of an entity"""
+        return self.labels.get(entity_id, entity_id)
 
-    def scrape_acuite_ratings(self):
-        """Scrape Acuite ratings with pagination"""
-        logger.info("Scraping Acuite ratings...")
+def action_fingerprint(action):
+    """Coarse class of a rating action used to match it across sources"""
+    for name, pattern in ACTION_CLASSES:
+        if pattern.search(action):
+            return name
+    return GENERIC_ACTION
+
+def event_key(company, day, fingerprint):
+    """Stable key of one rating event, shared by every source that reports it"""
+    raw = '\x1f'.join([company, day, fingerprint])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+# Companies worth alerting on, one name per line ('#' starts a comment);
+# without this file every company is kept
+WATCHLIST_PATH = 'watchlist.txt'
+
+def watch_text(text):
+    """Text normalized the way watchlist names are, padded so matches fall on word boundaries"""
+    words = re.sub(r'[^\w\s]', ' ', text.casefold().replace('&', ' and ')).split()
+    return f" {' '.join(words)} "
+
+class WatchlistMatcher:
+    """Aho-Corasick automaton over normalized watchlist names, matching whole words in one pass over the text"""
+    def __init__(self, names):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.size = 0
+        for name in names:
+            normalized = normalize_company(name)
+            if normalized:
+                self.add(f" {normalized} ")
+        self.build()
+
+    def add(self, pattern):
+        """Insert a pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+            state = next_state
+        if self.output[state] is None:
+            self.size += 1
+        self.output[state] = pattern.strip()
+
+    def build(self):
+        """Compute failure links breadth-first, inheriting outputs along them"""
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self.goto[state].items():
+                pending.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                if self.output[next_state] is None:
+                    self.output[next_state] = self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """First watchlist name found in text, or None"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in watch_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return output[state]
+        return None
+
+def is_exchange(agency):
+    """Whether an alert agency such as 'BSE (Debt)' is a stock exchange"""
+    return split_agency(agency)[0] in EXCHANGE_SOURCES
+
+def alert_fingerprint(agency, action):
+    """What an alert is matched on: its action class, or the subject of an exchange notice that is not about a rating"""
+    if is_exchange(agency) and not RATING_SUBJECT.search(action):
+        return NOTICE_PREFIX + ' '.join(re.sub(r'[^\w\s]', ' ', action.casefold()).split())
+    return action_fingerprint(action)
+
+class AlertDeduplicator:
+    """Collapses alerts reporting the same event into one, keeping the list of sources that reported it"""
+    def __init__(self, parse_date, lookup=None):
+        self.parse_date = parse_date
+        # (company, day) -> events recorded by earlier sweeps, so later sweeps continue them
+        self.lookup = lookup
+        self.events = {}
+        # Keys of the events this sweep's alerts started or joined, in first-seen order
+        self.touched = {}
+        # (company, day) -> keys of that day's events, earliest first
+        self.by_company_day = {}
+        # Alerts seen per agency; each event keeps the position of its headline
+        # alert so the sort order does not depend on thread timing
+        self.arrivals = {}
+
+    def day_events(self, company, day, parsed):
+        """Keys of a company's events on a day, loading the stored ones the first time the day comes up"""
+        keys = self.by_company_day.get((company, day))
+        if keys is None:
+            keys = self.by_company_day[(company, day)] = []
+            if self.lookup and parsed:
+                for stored in self.lookup(company, day):
+                    self.events[stored['event_key']] = {'company': company, 'fingerprint': stored.pop('fingerprint'), 'alert': stored, 'order': -1}
+                    keys.append(stored['event_key'])
+        return keys
+
+    def match(self, keys, agency, fingerprint):
+        """Key of the day's event an alert belongs to, or None if it starts a new one"""
+        # A generic exchange rating announcement attaches to the agency action it
+        # is disclosing; a source never merges into its own events this way
+        if fingerprint == GENERIC_ACTION and is_exchange(agency):
+            for key in keys:
+                event = self.events[key]
+                if not event['fingerprint'].startswith(NOTICE_PREFIX) and agency not in event['alert']['sources']:
+                    return key
+        for key in keys:
+            if self.events[key]['fingerprint'] == fingerprint:
+                return key
+        # A specific agency action takes over an event only exchanges have reported so far
+        if fingerprint != GENERIC_ACTION and not is_exchange(agency):
+            for key in keys:
+                event = self.events[key]
+                if event['fingerprint'] == GENERIC_ACTION and all(map(is_exchange, event['alert']['sources'])):
+                    return key
+        return None
+
+    def add(self, alert):
+        """Record an alert; returns its event key and whether it started an event or took over an exchange placeholder"""
+        company = alert.get('entity_id') or normalize_company(alert['company'])
+        parsed = self.parse_date(alert['date'])
+        day = parsed.isoformat() if parsed else alert['date']
+        agency = alert['agency']
+        fingerprint = alert_fingerprint(agency, alert['action'])
+        keys = self.day_events(company, day, parsed)
+        order = self.arrivals[agency] = self.arrivals.get(agency, -1) + 1
+        
+        key = self.match(keys, agency, fingerprint)
+        if key is not None:
+            event = self.events[key]
+            sources = event['alert']['sources']
+            headline = event['alert']['agency']
+            placeholder = not is_exchange(agency) and all(map(is_exchange, sources))
+            if placeholder:
+                # The agency action is news even though the disclosure was already notified
+                self.promote(event, alert, fingerprint, order)
+                event['promoted'] = True
+            elif (fingerprint == event['fingerprint'] and is_exchange(agency) == is_exchange(headline)
+                  and source_rank(agency) < source_rank(headline)):
+                # Among equals the first source in registry order heads the
+                # event, whichever scraper thread reached the pipeline first
+                self.promote(event, alert, fingerprint, order)
+            if agency not in sources:
+                sources.append(agency)
+                sources.sort(key=source_rank)
+            self.touched[key] = None
+            return key, placeholder
+        
+        key = event_key(company, day, fingerprint)
+        # A placeholder taken over by an agency action keeps the key it started with
+        suffix = 1
+        while key in self.events:
+            suffix += 1
+            key = event_key(company, day, f'{fingerprint}#{suffix}')
+        self.events[key] = {'company': company, 'fingerprint': fingerprint, 'alert': dict(alert, event_key=key, sources=[agency]), 'order': order}
+        self.touched[key] = None
+        keys.append(key)
+        return key, True
+
+    def promote(self, event, alert, fingerprint, order):
+        """Make an alert the headline of its event, keeping the event's key and sources"""
+        event['alert'].update((field, alert[field]) for field in alert.keys())
+        event['fingerprint'] = fingerprint
+        event['order'] = order
+
+    def entries(self):
+        """The events this sweep touched, with the company key and fingerprint they are matched on"""
+        return [self.events[key] for key in self.touched]
+
+    def alerts(self):
+        """One alert per event, each with its 'sources', in registry order of the headline source and then listing order"""
+        entries = sorted(self.entries(), key=lambda entry: (source_rank(entry['alert']['agency']), entry['order']))
+        return [entry['alert'] for entry in entries]
+
+class AlertPipeline:
+    """Dedup, store, filter and notify stages run on a background thread over each batch of alerts a scraper yields"""
+    def __init__(self, alert_system):
+        self.alert_system = alert_system
+        self.parse_date = alert_system.date_matcher.parse
+        self.deduplicator = AlertDeduplicator(self.parse_date, alert_system.alert_store.find_events)
+        self.seen = set()
+        self.count = 0
+        # Stored alerts that were some pager's newest, the only ones commit_state needs
+        self.saved_newest = set()
+        self.inserted = 0
+        self.new_keys = set()
+        self.started = time.monotonic()
+        self.first_event_seconds = None
+        self.batches = queue.Queue()
+        self.worker = threading.Thread(target=self.run, name='alert-pipeline', daemon=True)
+        self.worker.start()
+
+    def feed(self, alerts):
+        """Queue a batch of alerts and return at once, so scrapers keep browsing while it is processed"""
+        if alerts:
+            self.batches.put(alerts)
+
+    def run(self):
+        while True:
+            alerts = self.batches.get()
+            if alerts is None:
+                return
+            try:
+                alerts, events = self.dedup(alerts)
+                self.store(alerts)
+                self.notify(self.filter(events))
+            except Exception as e:
+                logger.error(f"Error processing {len(alerts)} alerts: {e}")
+
+    def dedup(self, alerts):
+        """Drop alerts already seen this sweep and fold the rest into events; returns them and the events they started"""
+        distinct = []
+        for alert in alerts:
+            key = alert_key(alert)
+            if key not in self.seen:
+                self.seen.add(key)
+                distinct.append(alert)
+        self.count += len(distinct)
+        
+        events = []
+        for alert in self.alert_system.resolve_entities(distinct):
+            key, is_new = self.deduplicator.add(alert)
+            if is_new:
+                events.append(self.deduplicator.events[key])
+        return distinct, events
+
+    def store(self, alerts):
+        """Save alerts to SQLite, the JSONL stream and the Parquet archive, noting which were a pager's newest"""
+        if not alerts:
+            return
+        self.inserted += self.alert_system.alert_store.add_alerts(alerts, self.parse_date)
+        if self.alert_system.alert_stream:
+            try:
+                self.alert_system.alert_stream.write(alerts)
+            except OSError as e:
+                logger.error(f"Error streaming alerts: {e}")
+        if self.alert_system.alert_archive:
+            try:
+                self.alert_system.alert_archive.append(alerts, self.parse_date)
+            except Exception as e:
+                logger.error(f"Error archiving alerts to Parquet: {e}")
+        newest = self.alert_system.newest_keys()
+        self.saved_newest.update(key for key in map(alert_key, alerts) if key in newest)
+
+    def filter(self, events):
+        """Record events and keep the ones no earlier sweep has seen, or that an agency action took over"""
+        new_keys = self.alert_system.alert_store.record_events(events, self.parse_date)
+        alerts = []
+        for event in events:
+            alert = event['alert']
+            alert['new'] = alert['event_key'] in new_keys or event.pop('promoted', False)
+            if alert['new']:
+                self.new_keys.add(alert['event_key'])
+                alerts.append(alert)
+        return alerts
+
+    def notify(self, events):
+        """Hand newly seen events to the system's event handlers"""
+        if not events:
+            return
+        if self.first_event_seconds is None:
+            self.first_event_seconds = time.monotonic() - self.started
+        logger.info(f"{len(events)} new events from {', '.join(sorted({event['agency'] for event in events}))}")
+        # Handlers get copies, since later batches can still add sources or take over a placeholder
+        events = [dict(event, sources=list(event['sources'])) for event in events]
+        for handler in self.alert_system.event_handlers:
+            try:
+                handler(events)
+            except Exception as e:
+                logger.error(f"Error in event handler: {e}")
+
+    def close(self):
+        """Drain the queue and update sources merged into already recorded events; returns every event of the sweep"""
+        self.batches.put(None)
+        self.worker.join()
+        self.alert_system.alert_store.record_events(self.deduplicator.entries(), self.parse_date)
+        events = self.deduplicator.alerts()
+        for event in events:
+            # Stored events this sweep only added sources to
+            event.setdefault('new', False)
+        logger.info(f"Deduplicated {self.count} alerts into {len(events)} events ({len(self.new_keys)} new)")
+        return events
+
+# Prometheus textfile written after every sweep
+METRICS_PATH = 'rating_alerts.prom'
+
+# Per-scraper metrics: name -> help text; all are counters exported as rating_alerts_scraper_<name>_total
+SCRAPER_METRICS = {
+    'duration_seconds': "Wall time spent running the scraper",
+    'page_load_seconds': "Time spent loading pages in the browser or over HTTP",
+    'wait_seconds': "Time spent in explicit browser waits",
+    'parse_seconds': "Time spent parsing HTML",
+    'pages_visited': "Pages loaded, including pagination and API pages",
+    'page_bytes': "Bytes of page source and HTTP response bodies read",
+    'rows_scanned': "Listing rows found on visited pages",
+    'rows_matched': "Alerts produced",
+    'errors': "Errors logged while scraping",
+    'polls_unchanged': "Polls skipped because the page matched the last poll's content hash",
+}
+
+# Source the code on this thread/task is scraping for, so metrics and errors are attributed to it
+current_source = contextvars.ContextVar('current_source', default=None)
+
+class ScraperMetrics:
+    """Per-source counters for the current sweep and since startup"""
+    def __init__(self):
+        self.run = {}
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def begin_run(self):
+        """Start counting a new sweep"""
+        with self._lock:
+            self.run = {}
+
+    def add(self, name, value=1, source=None):
+        """Add to a metric of the given source, or of the source currently being scraped"""
+        source = source or current_source.get() or 'other'
+        with self._lock:
+            for metrics in (self.run, self.totals):
+                values = metrics.setdefault(source, {})
+                values[name] = values.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name, source=None):
+        """Add the time spent in the block to a seconds metric"""
+        start = time.monotonic()
         try:
-            if not self.driver:
-                return []
-            
-            self.driver.get("https://connect.acuite.in/liveratings")
-            time.sleep(3)
-            
-            alerts = []
-            page_num = 1
-            
-            while True:
-                logger.info(f"Processing Acuite page {page_num}")
-                
-                # Extract ratings from current page
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Look for rating table rows
-                rating_rows = soup.find_all('tr')
-                
-                for row in rating_rows[1:]:  # Skip header row
-                    try:
-                        cells = row.find_all('td')
-                        if len(cells) >= 3:
-                            rating_date = cells[0].get_text(strip=True) if cells else ""
-                            company_name = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                            rating_action = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                            
-                            if company_name and self.is_today_date(rating_date):
-                                alerts.append({
-                                    'agency': 'Acuite',
-                                    'company': company_name,
-                                    'date': rating_date,
-                                    'action': rating_action,
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                    except Exception as e:
-                        logger.warning(f"Error extracting Acuite rating: {e}")
-                
-                # Check for next page
-                try:
-                    next_button = self.driver.find_element(By.XPATH, "//a[contains(text(), 'Next')] | //button[contains(text(), 'Next')]")
-                    if next_button.is_enabled():
-                        next_button.click()
-                        time.sleep(3)
-                        page_num += 1
-                    else:
-                        break
-                except NoSuchElementException:
-                    break
-            
-            logger.info(f"Found {len(alerts)} Acuite alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping Acuite: {e}")
-            return []
+            yield
+        finally:
+            self.add(name, time.monotonic() - start, source)
+
+    def summary_table(self):
+        """The current sweep's metrics as a fixed-width table, slowest source first"""
+        with self._lock:
+            run = {source: dict(values) for source, values in self.run.items()}
+        lines = [
+            f"{'source':<13} {'total s':>8} {'load s':>7} {'wait s':>7} {'parse s':>8} "
+            f"{'pages':>6} {'KiB':>7} {'rows':>6} {'matched':>8} {'errors':>7} {'unchanged':>9}"
+        ]
+        for source, values in sorted(run.items(), key=lambda item: -item[1].get('duration_seconds', 0)):
+            lines.append(
+                f"{source:<13} {values.get('duration_seconds', 0):>8.2f} {values.get('page_load_seconds', 0):>7.2f} "
+                f"{values.get('wait_seconds', 0):>7.2f} {values.get('parse_seconds', 0):>8.2f} "
+                f"{values.get('pages_visited', 0):>6} {values.get('page_bytes', 0) / 1024:>7.0f} "
+                f"{values.get('rows_scanned', 0):>6} {values.get('rows_matched', 0):>8} {values.get('errors', 0):>7} "
+                f"{values.get('polls_unchanged', 0):>9}"
+            )
+        return "\n".join(lines)
+
+    def prometheus_text(self):
+        """Totals since startup in the Prometheus text exposition format"""
+        with self._lock:
+            totals = {source: dict(values) for source, values in self.totals.items()}
+        lines = []
+        for name, help_text in SCRAPER_METRICS.items():
+            metric = f"rating_alerts_scraper_{name}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for source in sorted(totals):
+                lines.append(f'{metric}{{source="{source}"}} {totals[source].get(name, 0)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=METRICS_PATH):
+        """Write the totals atomically for a textfile collector"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+class MetricsLogHandler(logging.Handler):
+    """Counts errors logged while a source is being scraped"""
+    def __init__(self, metrics):
+        super().__init__(level=logging.ERROR)
+        self.metrics = metrics
+
+    def emit(self, record):
+        if current_source.get():
+            self.metrics.add('errors')
 
-    def scrape_crisil_ratings(self):
-        """Scrape CRISIL ratings with load more functionality"""
-        logger.info("Scraping CRISIL ratings...")
+def serve_metrics(metrics, port, host='127.0.0.1'):
+    """Serve the metrics at http://host:port/metrics from a background thread"""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+class StateStore:
+    """JSON document of scraper state shared across runs, written atomically"""
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
         try:
-            if not self.driver:
-                return []
-            
-            self.driver.get("https://www.crisil.com/en/home/our-businesses/ratings/ratings-actions.html")
-            time.sleep(3)
-            
-            alerts = []
-            
-            # Keep clicking "Load More" until no more content
-            while True:
-                try:
-                    load_more_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Load More')] | //a[contains(text(), 'Load More')]")
-                    if load_more_button.is_displayed() and load_more_button.is_enabled():
-                        load_more_button.click()
-                        time.sleep(3)
-                    else:
-                        break
-                except NoSuchElementException:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable state file {self.path}: {e}")
+            return {}
+
+    def get(self, section, key, default=None):
+        """Get a value from a section of the state"""
+        with self._lock:
+            return self.data.get(section, {}).get(key, default)
+
+    def set(self, section, key, value):
+        """Set a value in a section of the state; call save() to persist it"""
+        with self._lock:
+            self.data.setdefault(section, {})[key] = value
+
+    def save(self):
+        """Write the state to a temporary file and atomically replace the old one"""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+class AlertStore:
+    """SQLite store of collected alerts in WAL mode, indexed for range and company lookups"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS alerts (
+            id INTEGER PRIMARY KEY,
+            dedup_key TEXT NOT NULL UNIQUE,
+            agency TEXT NOT NULL,
+            segment TEXT NOT NULL DEFAULT '',
+            company TEXT NOT NULL COLLATE NOCASE,
+            date TEXT,
+            date_text TEXT,
+            action TEXT,
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_alerts_agency_date ON alerts (agency, date);
+        CREATE INDEX IF NOT EXISTS idx_alerts_company ON alerts (company);
+        CREATE TABLE IF NOT EXISTS events (
+            event_key TEXT PRIMARY KEY,
+            company TEXT NOT NULL COLLATE NOCASE,
+            date TEXT,
+            action TEXT,
+            sources TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            company_key TEXT,
+            agency TEXT,
+            fingerprint TEXT
+        );
+    """
+    # Columns added to the events table after it was first released
+    EVENT_COLUMNS = ['company_key', 'agency', 'fingerprint']
+
+    def __init__(self, path=ALERT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(events)")}
+        for column in self.EVENT_COLUMNS:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE events ADD COLUMN {column} TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_company_day ON events (company_key, date)")
+
+    def add_alerts(self, alerts, parse_date=None):
+        """Insert alerts in batches, ignoring ones already stored; returns the number inserted"""
+        inserted = 0
+        with self._lock:
+            for start in range(0, len(alerts), ALERT_INSERT_BATCH):
+                rows = []
+                for alert in alerts[start:start + ALERT_INSERT_BATCH]:
+                    agency, segment = split_agency(alert['agency'])
+                    parsed = parse_date(alert['date']) if parse_date else None
+                    rows.append((
+                        alert_key(alert), agency, segment, alert['company'],
+                        parsed.isoformat() if parsed else None, alert['date'], alert['action'], alert.get('timestamp'),
+                    ))
+                with self.conn:
+                    before = self.conn.total_changes
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO alerts (dedup_key, agency, segment, company, date, date_text, action, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    inserted += self.conn.total_changes - before
+        return inserted
+
+    def record_events(self, events, parse_date=None):
+        """Upsert deduplicated events, merging sources and promoted headlines; returns the keys not seen in earlier sweeps"""
+        new_keys = set()
+        with self._lock, self.conn:
+            for event in events:
+                alert = event['alert']
+                key = alert['event_key']
+                row = self.conn.execute("SELECT sources FROM events WHERE event_key = ?", (key,)).fetchone()
+                if row is None:
+                    parsed = parse_date(alert['date']) if parse_date else None
+                    self.conn.execute(
+                        "INSERT INTO events (event_key, company, date, action, sources, first_seen, company_key, agency, fingerprint) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, alert['company'], parsed.isoformat() if parsed else None, alert['action'],
+                         json.dumps(alert['sources']), datetime.now().isoformat(),
+                         event['company'], alert['agency'], event['fingerprint']),
+                    )
+                    new_keys.add(key)
+                    continue
+                sources = json.loads(row['sources'])
+                missing = [source for source in alert['sources'] if source not in sources]
+                self.conn.execute(
+                    "UPDATE events SET sources = ?, company_key = ?, agency = ?, action = ?, fingerprint = ? WHERE event_key = ?",
+                    (json.dumps(sources + missing), event['company'], alert['agency'], alert['action'], event['fingerprint'], key),
+                )
+        return new_keys
+
+    def find_events(self, company_key, day):
+        """Events recorded for a company key on an ISO day, as deduplicator alerts with their fingerprint"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT event_key, agency, company, date, action, sources, fingerprint FROM events "
+                "WHERE company_key = ? AND date = ? ORDER BY first_seen",
+                (company_key, day),
+            ).fetchall()
+        return [dict(row, sources=json.loads(row['sources'])) for row in rows]
+
+    def query(self, agency=None, segment=None, company=None, company_like=None,
+              start_date=None, end_date=None, limit=None):
+        """Return stored alerts as dicts, newest first"""
+        clauses = []
+        params = []
+        if agency:
+            clauses.append("agency = ?")
+            params.append(agency)
+        if segment:
+            clauses.append("segment = ?")
+            params.append(segment)
+        if company:
+            clauses.append("company = ?")
+            params.append(company)
+        if company_like:
+            clauses.append("company LIKE ?")
+            params.append(f"%{company_like}%")
+        if start_date:
+            clauses.append("date >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            clauses.append("date <= ?")
+            params.append(end_date.isoformat())
+        
+        sql = "SELECT agency, segment, company, date, date_text, action, timestamp FROM alerts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC, id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
+
+class AlertStream:
+    """Append-only JSONL sink with one segment per day; closed segments are gzipped"""
+    def __init__(self, directory=ALERT_STREAM_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.day = None
+        self.file = None
+        os.makedirs(directory, exist_ok=True)
+        # Segments left open by an earlier (possibly crashed) run are closed now
+        self.compress_closed(keep=date.today())
+
+    def segment_path(self, day):
+        """Uncompressed segment file for a day"""
+        return os.path.join(self.directory, f"alerts-{day.isoformat()}.jsonl")
+
+    def write(self, alerts):
+        """Append alerts to today's segment and flush them to disk"""
+        if not alerts:
+            return
+        with self._lock:
+            today = date.today()
+            if today != self.day:
+                self.rotate(today)
+            for alert in alerts:
+                self.file.write(json.dumps(alert, ensure_ascii=False, default=Alert.to_dict))
+                self.file.write('\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def rotate(self, day):
+        """Close the current segment, compress every earlier one and open the segment for day"""
+        if self.file:
+            self.file.close()
+        self.compress_closed(keep=day)
+        self.day = day
+        self.file = open(self.segment_path(day), 'a', encoding='utf-8')
+
+    def compress_closed(self, keep):
+        """Gzip every uncompressed segment except keep's, removing the originals"""
+        for path in glob.glob(os.path.join(self.directory, 'alerts-*.jsonl')):
+            if path == self.segment_path(keep):
+                continue
+            try:
+                with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(path)
+                logger.info(f"Compressed closed alert segment {path}")
+            except OSError as e:
+                logger.warning(f"Could not compress alert segment {path}: {e}")
+
+    def close(self):
+        """Close the open segment"""
+        with self._lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+                self.day = None
+
+class AlertArchive:
+    """Columnar history of alerts as a Parquet dataset, with partition-pruned loading into pandas"""
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.batches = 0
+
+    def append(self, alerts, parse_date):
+        """Write a batch of alerts as new Parquet files under their date/agency partitions"""
+        if not alerts:
+            return
+        columns = {name: [] for name in ARCHIVE_SCHEMA.names}
+        for alert in alerts:
+            agency, segment = split_agency(alert['agency'])
+            timestamp = alert.get('timestamp')
+            columns['date'].append(parse_date(alert['date']))
+            columns['agency'].append(agency)
+            columns['segment'].append(segment)
+            columns['company'].append(alert['company'])
+            columns['action'].append(alert['action'])
+            columns['rating'].append(normalize_rating(alert['action']))
+            columns['date_text'].append(alert['date'])
+            columns['timestamp'].append(datetime.fromisoformat(timestamp) if timestamp else None)
+        
+        table = pa.Table.from_pydict(columns, schema=ARCHIVE_SCHEMA)
+        self.batches += 1
+        ds.write_dataset(
+            table,
+            self.directory,
+            format='parquet',
+            partitioning=ARCHIVE_PARTITIONING,
+            basename_template=f"sweep-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}-{os.getpid()}-{self.batches}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+
+    def load(self, start_date=None, end_date=None, agencies=None, columns=None):
+        """Load archived alerts into a DataFrame, reading only matching partitions and the given columns"""
+        if not os.path.isdir(self.directory):
+            return pd.DataFrame(columns=columns or ARCHIVE_SCHEMA.names)
+        
+        dataset = ds.dataset(self.directory, format='parquet', schema=ARCHIVE_SCHEMA, partitioning=ARCHIVE_PARTITIONING)
+        condition = None
+        filters = []
+        if start_date:
+            filters.append(ds.field('date') >= start_date)
+        if end_date:
+            filters.append(ds.field('date') <= end_date)
+        if agencies:
+            filters.append(ds.field('agency').isin(list(agencies)))
+        for expression in filters:
+            condition = expression if condition is None else condition & expression
+        
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+class PaginationController:
+    """Stops paging a sorted listing once a whole page falls outside the date window
+    or the listing reaches the newest item seen by the previous run"""
+    def __init__(self, source, date_matcher, agency=None, watermark=None):
+        self.source = source
+        self.agency = agency or source
+        self.sort_order = SOURCE_SORT_ORDER.get(source)
+        self.date_matcher = date_matcher
+        self.watermark = watermark
+        self.newest_key = None
+        self.caught_up = False
+        self.pages = 0
+        self._page_dates = []
+
+    def is_new(self, alert):
+        """Check an alert against the previous run's watermark; False from the watermark on"""
+        if self.caught_up:
+            return False
+        key = alert_key(alert)
+        if key == self.watermark:
+            logger.info(f"{self.agency}: reached the newest item from the last run, skipping older rows")
+            self.caught_up = True
+            return False
+        if self.newest_key is None:
+            self.newest_key = key
+        return True
+
+    def observe(self, date_text):
+        """Record the date of a row on the current page"""
+        if self.sort_order:
+            parsed = self.date_matcher.parse(date_text)
+            if parsed:
+                self._page_dates.append(parsed)
+
+    def next_page(self):
+        """Finish the current page; return False if no later page can hold rows in the window"""
+        page_dates, self._page_dates = self._page_dates, []
+        self.pages += 1
+        if self.caught_up:
+            return False
+        if not page_dates:
+            return True
+        if self.sort_order == 'desc' and max(page_dates) < self.date_matcher.start:
+            logger.info(f"{self.source}: page {self.pages} is entirely before {self.date_matcher.start}, stopping")
+            return False
+        if self.sort_order == 'asc' and min(page_dates) > self.date_matcher.end:
+            logger.info(f"{self.source}: page {self.pages} is entirely after {self.date_matcher.end}, stopping")
+            return False
+        return True
+
+class FieldExtractor:
+    """Compiled extraction plan that pulls every field of a row in one pass over its subtree"""
+    def __init__(self, fields):
+        self.fields = {field: list(selectors) for field, selectors in fields.items()}
+        self.selectors = sorted({selector for selectors in self.fields.values() for selector in selectors})
+        # One regex screens every class and string; only hits are checked per selector
+        self.prefilter = re.compile('|'.join(re.escape(selector) for selector in self.selectors))
+
+    def extract(self, element):
+        """Return {field: text} for a row, with "" for fields that were not found"""
+        first_class = {}
+        first_string = {}
+        prefilter = self.prefilter
+        
+        for node in element.descendants:
+            if isinstance(node, NavigableString):
+                if node:
+                    text = node.lower()
+                    if prefilter.search(text):
+                        for selector in self.selectors:
+                            if selector not in first_string and selector in text:
+                                first_string[selector] = node
+            elif isinstance(node, Tag):
+                classes = node.get('class')
+                if classes:
+                    for value in classes:
+                        value = value.lower()
+                        if prefilter.search(value):
+                            for selector in self.selectors:
+                                if selector not in first_class and selector in value:
+                                    first_class[selector] = node
+        
+        # Same precedence as the original per-selector scans: for each selector
+        # in order, a class match beats a string match
+        values = {}
+        for field, selectors in self.fields.items():
+            values[field] = ""
+            for selector in selectors:
+                if selector in first_class:
+                    values[field] = first_class[selector].get_text(strip=True)
                     break
-            
-            # Extract all ratings after loading all content
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            rating_items = soup.find_all('div', class_=['rating-item', 'rating-card', 'announcement-item'])
-            
-            for item in rating_items:
+                if selector in first_string:
+                    values[field] = first_string[selector].strip()
+                    break
+        return values
+
+# Field extraction plans for the card/row layouts, compiled from each source's fields when it is installed
+FIELD_PLANS = {}
+
+class SiteReadiness:
+    """Declares what "ready" means for a site after a page load, click or page turn"""
+    def __init__(self, rows, spinner=None, timeout=15, settle_timeout=3):
+        # Locator for the rows/items the scraper reads
+        self.rows = rows
+        # Locator for a loading indicator that must be gone before reading
+        self.spinner = spinner
+        # Upper bound for a page to become ready after navigation or a click
+        self.timeout = timeout
+        # Upper bound for optional growth (infinite scroll, "Load More")
+        self.settle_timeout = settle_timeout
+
+SITE_READINESS = {
+    'ICRA': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'tr.gridrow, div.rating-item'),
+        spinner=(By.CSS_SELECTOR, '.loading, .spinner, [id*="UpdateProgress"]'),
+        timeout=15,
+    ),
+    'CareEdge': SiteReadiness(
+        rows=(By.CLASS_NAME, 'recent-ratings'),
+        spinner=(By.CSS_SELECTOR, '.loader, .spinner'),
+        timeout=20,
+        settle_timeout=3,
+    ),
+    'Acuite': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'table tr'),
+        spinner=(By.CSS_SELECTOR, '.dataTables_processing, .loader'),
+        timeout=15,
+    ),
+    'CRISIL': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'div.rating-item, div.rating-card, div.announcement-item'),
+        spinner=(By.CSS_SELECTOR, '.loader, .loading'),
+        timeout=15,
+        settle_timeout=5,
+    ),
+    'BSE': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'table tr'),
+        spinner=(By.CSS_SELECTOR, '.loader, #loader'),
+        timeout=20,
+    ),
+    'NSE': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'table tr, div.announcement-item'),
+        spinner=(By.CSS_SELECTOR, '.loader, .spinner-border'),
+        timeout=25,
+    ),
+    'SEBI': SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'table tr'),
+        timeout=15,
+    ),
+}
+
+class page_ready:
+    """Expected condition: document loaded, spinner gone and rows present"""
+    def __init__(self, readiness):
+        self.readiness = readiness
+
+    def __call__(self, driver):
+        if driver.execute_script("return document.readyState") != 'complete':
+            return False
+        if self.readiness.spinner:
+            for spinner in driver.find_elements(*self.readiness.spinner):
                 try:
-                    company_name = self.extract_text_from_element(item, ['company', 'entity', 'name', 'title'])
-                    rating_date = self.extract_text_from_element(item, ['date', 'rated-on', 'timestamp'])
-                    rating_action = self.extract_text_from_element(item, ['action', 'rating', 'grade', 'description'])
-                    
-                    if company_name and self.is_today_date(rating_date):
-                        alerts.append({
-                            'agency': 'CRISIL',
-                            'company': company_name,
-                            'date': rating_date,
-                            'action': rating_action,
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except Exception as e:
-                    logger.warning(f"Error extracting CRISIL rating: {e}")
-            
-            logger.info(f"Found {len(alerts)} CRISIL alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping CRISIL: {e}")
-            return []
+                    if spinner.is_displayed():
+                        return False
+                except StaleElementReferenceException:
+                    continue
+        return len(driver.find_elements(*self.readiness.rows)) > 0
 
-    def scrape_bse_announcements(self):
-        """Scrape BSE announcements for current date (Equity and Debt segments)"""
-        logger.info("Scraping BSE announcements...")
-        try:
-            if not self.driver:
-                return []
-            
-            alerts = []
-            current_date = self.get_current_date_str()['dd/mm/yyyy']
-            
-            # BSE Corporate Announcements URL
-            self.driver.get("https://www.bseindia.com/corporates/ann.html")
-            time.sleep(3)
-            
-            # Set current date
+class rows_refreshed:
+    """Expected condition: the first watched row went stale or the row count changed"""
+    def __init__(self, locator, marker, previous_count):
+        self.locator = locator
+        self.marker = marker
+        self.previous_count = previous_count
+
+    def __call__(self, driver):
+        if self.marker is not None:
             try:
-                from_date = self.driver.find_element(By.ID, "txtFromDt")
-                from_date.clear()
-                from_date.send_keys(current_date)
-                
-                to_date = self.driver.find_element(By.ID, "txtToDt")
-                to_date.clear()
-                to_date.send_keys(current_date)
-            except NoSuchElementException:
-                logger.warning("Date fields not found on BSE")
-            
-            # Check both Equity and Debt segments
-            segments = ['Equity', 'Debt']
-            
-            for segment in segments:
-                try:
-                    logger.info(f"Processing BSE {segment} segment")
-                    
-                    # Select segment if dropdown exists
-                    try:
-                        segment_dropdown = self.driver.find_element(By.ID, "ddlSegment")
-                        for option in segment_dropdown.find_elements(By.TAG_NAME, "option"):
-                            if segment.lower() in option.text.lower():
-                                option.click()
-                                break
-                    except NoSuchElementException:
-                        pass
-                    
-                    # Click submit/search button
-                    try:
-                        submit_btn = self.driver.find_element(By.ID, "btnSubmit")
-                        submit_btn.click()
-                        time.sleep(3)
-                    except NoSuchElementException:
-                        pass
-                    
-                    # Extract announcements
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    announcement_rows = soup.find_all('tr')[1:]  # Skip header
-                    
-                    for row in announcement_rows:
-                        try:
-                            cells = row.find_all('td')
-                            if len(cells) >= 3:
-                                company_name = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                                subject = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                                
-                                if company_name:
-                                    alerts.append({
-                                        'agency': f'BSE ({segment})',
-                                        'company': company_name,
-                                        'date': current_date,
-                                        'action': subject,
-                                        'timestamp': datetime.now().isoformat()
-                                    })
-                        except Exception as e:
-                            logger.warning(f"Error extracting BSE announcement: {e}")
-                            
-                except Exception as e:
-                    logger.warning(f"Error processing BSE {segment}: {e}")
-            
-            logger.info(f"Found {len(alerts)} BSE alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping BSE: {e}")
-            return []
+                self.marker.is_enabled()
+            except StaleElementReferenceException:
+                return True
+        return len(driver.find_elements(*self.locator)) != self.previous_count
+
+class SourceConfig:
+    """Declarative description of a source: where its listing lives, how to filter and page it and how to read its rows"""
+    def __init__(self, name, url, hooks=None, http=None, async_http=None,
+                 date_fields=None, date_format='dd/mm/yyyy', submit=None,
+                 segments=None, segment_select=None, segment_tab=None,
+                 pagination='single', next_button=None, rows=None, fields=None, columns=None,
+                 company=None, scroll_container=None, readiness=None, strainer=None, sort_order='desc', enabled=True):
+        # Agency name alerts are reported under, and the key of the per-source tables
+        self.name = name
+        self.url = url
+        # Disabled sources only run when asked for by name; a lazily imported
+        # source takes this from its registry entry when it loads
+        self.enabled = enabled
+        # SourceScraper subclass overriding the steps the listing does differently
+        self.hooks = hooks or SourceScraper
+        # Names of the system's sync and async HTTP fast paths, if the source has them
+        self.http = http
+        self.async_http = async_http
+        # (from, to) locators of the date window inputs, the get_current_date_str
+        # format typed into them and the locator of the button applying them
+        self.date_fields = date_fields
+        self.date_format = date_format
+        self.submit = submit
+        # Segments listed separately, chosen with a <select> or a tab whose XPath has a {segment} placeholder
+        self.segments = segments or []
+        self.segment_select = segment_select
+        self.segment_tab = segment_tab
+        # 'single', 'next' (click next_button per page), 'load_more' (click next_button
+        # until no rows are added) or 'scroll' (scroll scroll_container, or the page, until it stops growing)
+        self.pagination = pagination
+        self.next_button = next_button
+        self.scroll_container = scroll_container
+        # (tag, classes) alternatives for the data rows, first match wins; classes may be None
+        self.rows = rows or []
+        # Row fields as FieldExtractor selectors, or as column positions of <td> cells
+        self.fields = fields
+        self.columns = columns
+        # Company reported for listings whose rows name none
+        self.company = company
+        self.readiness = readiness
+        self.strainer = strainer
+        self.sort_order = sort_order
+
+    def find_rows(self, soup):
+        """Data rows of a parsed page, from the first row alternative that matches"""
+        for tag, classes in self.rows:
+            rows = soup.find_all(tag, class_=classes) if classes else soup.find_all(tag)
+            if rows:
+                return rows
+        return []
+
+    def install(self):
+        """Publish the readiness check, strainer, field plan and row order to the shared per-source tables"""
+        if self.readiness:
+            SITE_READINESS[self.name] = self.readiness
+        if self.strainer:
+            PARSE_STRAINERS[self.name] = self.strainer
+        if self.fields:
+            FIELD_PLANS[self.name] = FieldExtractor(self.fields)
+        SOURCE_SORT_ORDER.setdefault(self.name, self.sort_order)
 
-    def scrape_nse_announcements(self):
-        """Scrape NSE announcements for Equity and Debt"""
-        logger.info("Scraping NSE announcements...")
+class SourceScraper:
+    """Browser flow for a configured source; subclass it as a source's hooks to override single steps"""
+    def __init__(self, config, alert_system):
+        self.config = config
+        self.alert_system = alert_system
+
+    @property
+    def driver(self):
+        return self.alert_system.driver
+
+    def scrape(self):
+        """Yield the alerts of each listing page (and segment)"""
+        name = self.config.name
+        logger.info(f"Scraping {name}...")
         try:
             if not self.driver:
-                return []
-            
-            alerts = []
-            
-            # NSE Announcements URL
-            self.driver.get("https://www.nseindia.com/companies-listing/corporate-filings-announcements")
-            time.sleep(5)
+                return
             
-            segments = ['Equity', 'Debt']
+            self.alert_system.load_page(self.config.url)
+            self.alert_system.wait_until_ready(name)
+            self.apply_date_filter()
             
-            for segment in segments:
-                try:
-                    logger.info(f"Processing NSE {segment} segment")
-                    
-                    # Click on segment tab
-                    try:
-                        segment_tab = self.driver.find_element(By.XPATH, f"//a[contains(text(), '{segment}')]")
-                        segment_tab.click()
-                        time.sleep(3)
-                    except NoSuchElementException:
-                        logger.warning(f"NSE {segment} tab not found")
-                        continue
-                    
-                    # Extract announcements
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    
-                    # Look for announcement table or list
-                    announcement_rows = soup.find_all('tr') or soup.find_all('div', class_='announcement-item')
-                    
-                    for row in announcement_rows:
-                        try:
-                            if row.name == 'tr':
-                                cells = row.find_all('td')
-                                if len(cells) >= 3:
-                                    company_name = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                                    subject = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                                    date_text = cells[0].get_text(strip=True) if cells else ""
-                            else:
-                                company_name = self.extract_text_from_element(row, ['company', 'symbol'])
-                                subject = self.extract_text_from_element(row, ['subject', 'title'])
-                                date_text = self.extract_text_from_element(row, ['date', 'time'])
-                            
-                            if company_name and self.is_today_date(date_text):
-                                alerts.append({
-                                    'agency': f'NSE ({segment})',
-                                    'company': company_name,
-                                    'date': date_text,
-                                    'action': subject,
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                        except Exception as e:
-                            logger.warning(f"Error extracting NSE announcement: {e}")
-                            
-                except Exception as e:
-                    logger.warning(f"Error processing NSE {segment}: {e}")
+            found = 0
+            for segment in self.config.segments or [None]:
+                agency = f'{name} ({segment})' if segment else name
+                if segment and not self.select_segment(segment):
+                    logger.warning(f"{name} {segment} segment not found")
+                    continue
+                pager = self.alert_system.create_pager(name, agency)
+                for soup in self.pages(pager):
+                    page_alerts = self.extract(soup, pager, agency)
+                    found += len(page_alerts)
+                    yield page_alerts
             
-            logger.info(f"Found {len(alerts)} NSE alerts")
-            return alerts
+            self.alert_system.log_wait_stats(name)
+            logger.info(f"Found {found} {name} alerts")
             
         except Exception as e:
-            logger.error(f"Error scraping NSE: {e}")
-            return []
+            logger.error(f"Error scraping {name}: {e}")
 
-    def scrape_sebi_announcements(self):
-        """Scrape SEBI announcements with pagination and current date selection"""
-        logger.info("Scraping SEBI announcements...")
+    def apply_date_filter(self):
+        """Type the date window into the listing's filter fields and apply it"""
+        if not self.config.date_fields:
+            return
+        from_field, to_field = self.config.date_fields
         try:
-            if not self.driver:
-                return []
-            
-            self.driver.get("https://www.sebi.gov.in/sebiweb/home/HomeAction.do?doListing=yes&sid=1&ssid=1&smid=1")
-            time.sleep(3)
-            
-            alerts = []
-            current_date = self.get_current_date_str()
-            
-            # Set current date filter if available
+            for locator, dates in ((from_field, self.alert_system.get_window_start_str()),
+                                   (to_field, self.alert_system.get_current_date_str())):
+                field = self.driver.find_element(*locator)
+                field.clear()
+                field.send_keys(dates[self.config.date_format])
+        except NoSuchElementException:
+            logger.info(f"{self.config.name} date filter not found, proceeding with default view")
+            return
+        if self.config.submit and not self.config.segments:
+            self.click(self.config.submit)
+
+    def select_segment(self, segment):
+        """Switch the listing to a segment through its tab, or its dropdown and submit button"""
+        if self.config.segment_tab:
+            tab = (By.XPATH, self.config.segment_tab.format(segment=segment))
+            if not self.driver.find_elements(*tab):
+                return False
+            # A segment listing the same rows as the last one is still selected
+            self.click(tab)
+            return True
+        try:
+            dropdown = self.driver.find_element(*self.config.segment_select)
+        except NoSuchElementException:
+            return False
+        for option in dropdown.find_elements(By.TAG_NAME, "option"):
+            if segment.lower() in option.text.lower():
+                option.click()
+                break
+        else:
+            return False
+        if self.config.submit:
+            self.click(self.config.submit)
+        return True
+
+    def click(self, locator, settle=False):
+        """Click a control and wait for the rows to change; False if it is missing, disabled or changes nothing"""
+        name = self.config.name
+        try:
+            button = self.driver.find_element(*locator)
+            if not (button.is_displayed() and button.is_enabled()):
+                return False
+        except NoSuchElementException:
+            return False
+        snapshot = self.alert_system.snapshot_rows(name)
+        button.click()
+        if settle:
+            # Only the row count is compared, since earlier rows stay in place
+            return self.alert_system.wait_until_refreshed(name, (None, snapshot[1]), SITE_READINESS[name].settle_timeout)
+        return self.alert_system.wait_until_refreshed(name, snapshot)
+
+    def scroll_to_end(self):
+        """Scroll the listing until it stops growing"""
+        container = "document.scrollingElement"
+        if self.config.scroll_container:
+            if not self.driver.find_elements(By.CSS_SELECTOR, self.config.scroll_container):
+                logger.warning(f"{self.config.name} listing {self.config.scroll_container} not found")
+                return
+            container = f"document.querySelector('{self.config.scroll_container}')"
+        height_script = f"return {container}.scrollHeight"
+        last_height = self.driver.execute_script(height_script)
+        while True:
+            self.driver.execute_script(f"{container}.scrollTo(0, {container}.scrollHeight);")
+            grew = self.alert_system.wait_for(
+                self.config.name,
+                lambda d: d.execute_script(height_script) != last_height,
+                timeout=SITE_READINESS[self.config.name].settle_timeout,
+            )
+            if not grew:
+                return
+            last_height = self.driver.execute_script(height_script)
+
+    def expand(self):
+        """Bring every row of a "Load More" or infinite-scroll listing onto the page"""
+        if self.config.pagination == 'load_more':
+            while self.click(self.config.next_button, settle=True):
+                pass
+        elif self.config.pagination == 'scroll':
+            self.scroll_to_end()
+
+    def pages(self, pager):
+        """Yield the parsed listing once per page, following the source's pagination strategy"""
+        name = self.config.name
+        self.expand()
+        page_num = 1
+        while True:
+            logger.info(f"Processing {name} page {page_num}")
+            yield self.alert_system.parse_page(self.alert_system.read_page_source(), name)
+            if self.config.pagination != 'next' or not pager.next_page():
+                return
+            if not self.click(self.config.next_button):
+                return
+            page_num += 1
+
+    def read_row(self, row):
+        """The row's company, date and action, or None for rows without enough cells (such as headers)"""
+        if self.config.columns:
+            cells = row.find_all('td')
+            if len(cells) <= max(self.config.columns.values()):
+                return None
+            return {field: cells[index].get_text(strip=True) for field, index in self.config.columns.items()}
+        return FIELD_PLANS[self.config.name].extract(row)
+
+    def extract(self, soup, pager, agency):
+        """Alerts in the date window from one parsed page"""
+        system = self.alert_system
+        rows = self.config.find_rows(soup)
+        system.metrics.add('rows_scanned', len(rows))
+        
+        alerts = []
+        for row in rows:
             try:
-                date_input = self.driver.find_element(By.NAME, "fromDate")
-                date_input.clear()
-                date_input.send_keys(current_date['dd-mm-yyyy'])
+                fields = self.read_row(row)
+                if fields is None:
+                    continue
+                company_name = fields.get('company') or self.config.company
+                rating_date = fields['date']
+                rating_action = fields['action']
+                pager.observe(rating_date)
                 
-                to_date_input = self.driver.find_element(By.NAME, "toDate")
-                to_date_input.clear()
-                to_date_input.send_keys(current_date['dd-mm-yyyy'])
-                
-                # Click search button
-                search_btn = self.driver.find_element(By.XPATH, "//input[@type='submit']")
-                search_btn.click()
-                time.sleep(3)
-            except NoSuchElementException:
-                logger.warning("SEBI date filter not found")
-            
+                if company_name and system.is_today_date(rating_date) and system.on_watchlist(company_name, rating_action):
+                    alert = Alert(
+                        agency=agency,
+                        company=company_name,
+                        date=rating_date,
+                        action=rating_action,
+                        timestamp=system.sweep_timestamp,
+                    )
+                    if not pager.is_new(alert):
+                        break
+                    alerts.append(alert)
+            except Exception as e:
+                logger.warning(f"Error extracting {agency} row: {e}")
+        
+        return alerts
+
+class ContentHashScraper(SourceScraper):
+    """Skips parsing when the fully loaded listing hashes the same as on the last poll"""
+    def pages(self, pager):
+        system = self.alert_system
+        name = self.config.name
+        self.expand()
+        digest = system.content_digest(name)
+        if system.content_unchanged(name, digest):
+            return
+        yield system.parse_page(system.read_page_source(), name)
+        # Only staged once the page's rows were extracted
+        system.remember_content(name, digest)
+
+class BSEScraper(SourceScraper):
+    """Searches each segment through the form's dropdown; the rows carry no date, the search already limits them to the window"""
+    def select_segment(self, segment):
+        # Without the dropdown the search still runs, on whatever segment the form shows
+        if not self.driver.find_elements(*self.config.segment_select):
+            self.click(self.config.submit)
+            return True
+        return super().select_segment(segment)
+
+    def read_row(self, row):
+        fields = super().read_row(row)
+        if fields is not None:
+            fields['date'] = self.alert_system.get_current_date_str()[self.config.date_format]
+        return fields
+
+class NSEScraper(SourceScraper):
+    """Reads the announcements table, or the announcement cards NSE shows in its place"""
+    def pages(self, pager):
+        system = self.alert_system
+        page_source = system.read_page_source()
+        soup = system.parse_page(page_source, 'NSE')
+        if not soup.find('tr'):
+            soup = system.parse_page(page_source, 'NSE cards')
+        yield soup
+
+    def read_row(self, row):
+        if row.name == 'tr':
+            return super().read_row(row)
+        return FIELD_PLANS[self.config.name].extract(row)
+
+class LazySource:
+    """Registry entry naming a 'module:attribute' SourceConfig that is imported the first time the source runs"""
+    def __init__(self, path, enabled=True):
+        self.path = path
+        # Kept here so listing the enabled sources never imports a plugin
+        self.enabled = enabled
+        # Unknown until the module loads, so source_rank keeps the agency as reported
+        self.segments = []
+
+    def load(self):
+        """Import the config, give it this entry's enabled flag and install its hooks"""
+        module_name, attribute = self.path.split(':')
+        config = getattr(importlib.import_module(module_name), attribute)
+        config.enabled = self.enabled
+        config.install()
+        return config
+
+# Every source a sweep runs, in report order. Entries are a SourceConfig or a
+# LazySource naming one, imported the first time the source runs
+SOURCE_REGISTRY = {
+    'ICRA': SourceConfig(
+        'ICRA', "https://www.icra.in/Rating/RatingList.aspx",
+        date_fields=((By.ID, "txtFromDate"), (By.ID, "txtToDate")),
+        submit=(By.ID, "btnSearch"),
+        pagination='next',
+        next_button=(By.XPATH, "//a[contains(text(), 'Next')] | //input[@value='Next']"),
+        rows=[('tr', 'gridrow'), ('div', 'rating-item')],
+        fields={
+            'company': ['company', 'entity', 'name'],
+            'date': ['date', 'rated-on'],
+            'action': ['action', 'rating', 'grade'],
+        },
+    ),
+    'CareEdge': SourceConfig(
+        'CareEdge', "https://www.careratings.com/",
+        hooks=ContentHashScraper,
+        pagination='scroll',
+        scroll_container='.recent-ratings',
+        rows=[('div', ['rating-item', 'rating-card', 'recent-rating-item'])],
+        fields={
+            'company': ['company', 'entity', 'name'],
+            'date': ['date', 'rated-on', 'timestamp'],
+            'action': ['action', 'rating', 'grade'],
+        },
+    ),
+    'Acuite': SourceConfig(
+        'Acuite', ACUITE_LIVE_RATINGS_URL,
+        http='fetch_acuite_http',
+        async_http='fetch_acuite_async',
+        pagination='next',
+        next_button=(By.XPATH, "//a[contains(text(), 'Next')] | //button[contains(text(), 'Next')]"),
+        rows=[('tr', None)],
+        columns={'date': 0, 'company': 1, 'action': 2},
+    ),
+    'CRISIL': SourceConfig(
+        'CRISIL', "https://www.crisil.com/en/home/our-businesses/ratings/ratings-actions.html",
+        hooks=ContentHashScraper,
+        pagination='load_more',
+        next_button=(By.XPATH, "//button[contains(text(), 'Load More')] | //a[contains(text(), 'Load More')]"),
+        rows=[('div', ['rating-item', 'rating-card', 'announcement-item'])],
+        fields={
+            'company': ['company', 'entity', 'name', 'title'],
+            'date': ['date', 'rated-on', 'timestamp'],
+            'action': ['action', 'rating', 'grade', 'description'],
+        },
+    ),
+    'BSE': SourceConfig(
+        'BSE', "https://www.bseindia.com/corporates/ann.html",
+        hooks=BSEScraper,
+        http='fetch_bse_http',
+        async_http='fetch_bse_async',
+        date_fields=((By.ID, "txtFromDt"), (By.ID, "txtToDt")),
+        submit=(By.ID, "btnSubmit"),
+        segments=['Equity', 'Debt'],
+        segment_select=(By.ID, "ddlSegment"),
+        rows=[('tr', None)],
+        columns={'company': 1, 'action': 2},
+    ),
+    'NSE': SourceConfig(
+        'NSE', NSE_ANNOUNCEMENTS_PAGE_URL,
+        hooks=NSEScraper,
+        http='fetch_nse_http',
+        async_http='fetch_nse_async',
+        segments=['Equity', 'Debt'],
+        segment_tab="//a[contains(text(), '{segment}')]",
+        rows=[('tr', None), ('div', 'announcement-item')],
+        columns={'date': 0, 'company': 1, 'action': 2},
+        fields={
+            'company': ['company', 'symbol'],
+            'date': ['date', 'time'],
+            'action': ['subject', 'title'],
+        },
+    ),
+    'SEBI': SourceConfig(
+        'SEBI', SEBI_LISTING_URL,
+        http='fetch_sebi_http',
+        async_http='fetch_sebi_async',
+        date_fields=((By.NAME, "fromDate"), (By.NAME, "toDate")),
+        date_format='dd-mm-yyyy',
+        submit=(By.XPATH, "//input[@type='submit']"),
+        pagination='next',
+        next_button=(By.XPATH, "//a[contains(text(), 'Next')] | //input[@value='Next']"),
+        rows=[('tr', None)],
+        columns={'date': 0, 'action': 1},
+        company='SEBI Announcement',
+    ),
+    # Off until a recorded fixture confirms their URLs and selectors; run them with --sources
+    'India Ratings': LazySource('sources.india_ratings:SOURCE', enabled=False),
+    'Brickwork': LazySource('sources.brickwork:SOURCE', enabled=False),
+    'Infomerics': LazySource('sources.infomerics:SOURCE', enabled=False),
+}
+
+# The built-in sources publish their field plans and tables at import, as plugins do when they load
+for builtin in SOURCE_REGISTRY.values():
+    if isinstance(builtin, SourceConfig):
+        builtin.install()
+
+def register_source(name, config, enabled=True):
+    """Add or replace a source; config is a SourceConfig or a lazily imported 'module:attribute' string"""
+    if isinstance(config, str):
+        config = LazySource(config, enabled)
+    else:
+        config.enabled = enabled
+    SOURCE_REGISTRY[name] = config
+
+def source_rank(agency):
+    """Sort key putting an alert agency such as 'BSE (Debt)' in registry order, segments in their listed order"""
+    name, segment = split_agency(agency)
+    names = list(SOURCE_REGISTRY)
+    if name not in names:
+        return len(names), 0, agency
+    segments = SOURCE_REGISTRY[name].segments
+    return names.index(name), segments.index(segment) if segment in segments else len(segments), agency
+
+def enabled_sources():
+    """Names of the registered sources a sweep runs when none are named, read from the registry without importing any plugin"""
+    return [name for name, config in SOURCE_REGISTRY.items() if config.enabled]
+
+def load_source(name):
+    """The config of a registered source, importing its module the first time"""
+    config = SOURCE_REGISTRY[name]
+    if isinstance(config, LazySource):
+        path = config.path
+        config = SOURCE_REGISTRY[name] = config.load()
+        logger.info(f"Loaded source {name} from {path}")
+    return config
+
+class RatingAgencyAlertSystem:
+    def __init__(self, max_drivers=DEFAULT_MAX_DRIVERS, http_fast_path=True, target_date=None, window_days=0,
+                 incremental=True, state_path=STATE_PATH, alert_db_path=ALERT_DB_PATH, json_export=False,
+                 stream_dir=ALERT_STREAM_DIR, archive_dir=ARCHIVE_DIR, entities_path=NBFC_ENTITIES_PATH,
+                 watchlist_path=WATCHLIST_PATH, lean_browser=True, driver_max_uses=DRIVER_MAX_USES,
+                 driver_max_rss_mb=DRIVER_MAX_RSS_MB, metrics_path=METRICS_PATH):
+        self.max_drivers = max_drivers
+        self.driver_max_uses = driver_max_uses
+        self.driver_max_rss_mb = driver_max_rss_mb
+        self.lean_browser = lean_browser
+        self.http_fast_path = http_fast_path
+        self.target_date = target_date
+        self.window_days = window_days
+        self.date_matcher = DateMatcher(target_date, window_days)
+        self.sweep_timestamp = datetime.now().isoformat()
+        # Backfills of a fixed date neither use nor move the live watermarks
+        self.incremental_enabled = incremental
+        self.incremental = incremental and target_date is None
+        self.state = StateStore(state_path)
+        self.alert_store = AlertStore(alert_db_path)
+        self.alert_stream = AlertStream(stream_dir) if stream_dir else None
+        self.alert_archive = AlertArchive(archive_dir) if archive_dir else None
+        self.entities = self.load_entities(entities_path)
+        self.watchlist = self.load_watchlist(watchlist_path)
+        self.json_export = json_export
+        self.metrics = ScraperMetrics()
+        self.metrics_path = metrics_path
+        self.metrics_log_handler = MetricsLogHandler(self.metrics)
+        logger.addHandler(self.metrics_log_handler)
+        self.pagers = []
+        self.pending_hashes = {}
+        self.sweep_counts = {}
+        # Callables given each batch of newly seen events as soon as it is stored
+        self.event_handlers = []
+        self.http_sessions = {}
+        self.selector_plans = {}
+        self._local = threading.local()
+        self.wait_stats = {}
+        self._lock = threading.Lock()
+        self.setup_selenium()
+        self.alerts = []
+        
+    @property
+    def driver(self):
+        """WebDriver bound to the current thread, checked out from the pool on first use"""
+        if not hasattr(self._local, 'driver'):
+            self.bind_driver(self.driver_pool.acquire())
+        return self._local.driver
+
+    @property
+    def wait(self):
+        """WebDriverWait for the current thread's driver"""
+        if self.driver is None:
+            return None
+        return self._local.wait
+
+    def bind_driver(self, driver):
+        """Bind a driver (or None) to the current thread"""
+        self._local.driver = driver
+        self._local.wait = WebDriverWait(driver, 20) if driver else None
+
+    def release_driver(self):
+        """Return the current thread's driver to the pool, if it checked one out"""
+        driver = getattr(self._local, 'driver', None)
+        if hasattr(self._local, 'driver'):
+            del self._local.driver
+            del self._local.wait
+        self.driver_pool.release(driver)
+
+    def setup_selenium(self):
+        """Setup the pool of Selenium WebDrivers and start the first one"""
+        self.driver_pool = DriverPool(
+            self.create_driver,
+            max_size=self.max_drivers,
+            max_uses=self.driver_max_uses,
+            max_rss_mb=self.driver_max_rss_mb,
+        )
+        self.driver_pool.prewarm(1)
+
+    def create_driver(self):
+        """Create a headless Chrome WebDriver, or None if Chrome cannot be started"""
+        return create_chrome_driver(lean=self.lean_browser)
+
+    def get_http_session(self, source):
+        """Get the pooled keep-alive requests.Session for a source"""
+        with self._lock:
+            session = self.http_sessions.get(source)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(HTTP_HEADERS)
+                retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.http_sessions[source] = session
+        return session
+
+    def scrape_with_fallback(self, source, fetcher, fallback):
+        """Try the lightweight HTTP fetcher first and use the Selenium scraper only if it fails"""
+        if self.http_fast_path:
+            try:
+                alerts = fetcher()
+                if alerts is not None:
+                    logger.info(f"Found {len(alerts)} {source} alerts via HTTP")
+                    yield alerts
+                    return
+                logger.info(f"{source} HTTP response had no usable listing, falling back to Selenium")
+            except Exception as e:
+                logger.warning(f"{source} HTTP fast path failed, falling back to Selenium: {e}")
+        yield from fallback()
+
+    def load_page(self, url):
+        """Navigate the thread's driver to a URL, recording load time"""
+        with self.metrics.timer('page_load_seconds'):
+            self.driver.get(url)
+        self.metrics.add('pages_visited')
+
+    def read_page_source(self):
+        """The driver's current page source, counting its size"""
+        html = self.driver.page_source
+        self.metrics.add('page_bytes', len(html))
+        return html
+
+    def parse_page(self, html, target=None):
+        """parse_html with parse time recorded"""
+        with self.metrics.timer('parse_seconds'):
+            return parse_html(html, target)
+
+    def http_request(self, session, method, url, **kwargs):
+        """Issue a request on a pooled session, recording load time, page count and body size"""
+        with self.metrics.timer('page_load_seconds'):
+            response = session.request(method, url, **kwargs)
+        self.metrics.add('pages_visited')
+        self.metrics.add('page_bytes', len(response.content))
+        return response
+
+    def wait_for(self, site, condition, timeout=None):
+        """Wait on a condition with the site's timeout, recording the time spent"""
+        readiness = SITE_READINESS[site]
+        start = time.monotonic()
+        timed_out = False
+        try:
+            WebDriverWait(self.driver, timeout or readiness.timeout, poll_frequency=0.2).until(condition)
+        except TimeoutException:
+            timed_out = True
+        finally:
+            self.record_wait(site, time.monotonic() - start, timed_out)
+        return not timed_out
+
+    def wait_until_ready(self, site):
+        """Wait until the site's rows are present and no loading indicator is visible"""
+        ready = self.wait_for(site, page_ready(SITE_READINESS[site]))
+        if not ready:
+            logger.warning(f"{site} page not ready after {SITE_READINESS[site].timeout}s, reading it anyway")
+        return ready
+
+    def snapshot_rows(self, site):
+        """Capture the first watched row and the row count before a click"""
+        rows = self.driver.find_elements(*SITE_READINESS[site].rows)
+        return (rows[0] if rows else None, len(rows))
+
+    def wait_until_refreshed(self, site, snapshot, timeout=None):
+        """Wait until the rows captured in snapshot are replaced, then until the page is ready"""
+        marker, count = snapshot
+        self.metrics.add('pages_visited')
+        if not self.wait_for(site, rows_refreshed(SITE_READINESS[site].rows, marker, count), timeout):
+            return False
+        return self.wait_until_ready(site)
+
+    def record_wait(self, site, seconds, timed_out=False):
+        """Accumulate wait-time metrics for a site"""
+        with self._lock:
+            stats = self.wait_stats.setdefault(site, {'waits': 0, 'seconds': 0.0, 'timeouts': 0})
+            stats['waits'] += 1
+            stats['seconds'] += seconds
+            stats['timeouts'] += int(timed_out)
+        self.metrics.add('wait_seconds', seconds)
+
+    def log_wait_stats(self, site):
+        """Log the wait-time metric for a site"""
+        stats = self.wait_stats.get(site)
+        if stats:
+            logger.info(f"{site} waited {stats['seconds']:.2f}s over {stats['waits']} waits ({stats['timeouts']} timeouts)")
+
+    def set_window(self, target_date=None, window_days=0):
+        """Point later sweeps at another target date/window, e.g. per job in the browser daemon"""
+        self.target_date = target_date
+        self.window_days = window_days
+        self.incremental = self.incremental_enabled and target_date is None
+
+    def begin_sweep(self):
+        """Reset per-sweep state; the date window is rebuilt so long-running processes roll over"""
+        self.date_matcher = DateMatcher(self.target_date, self.window_days)
+        # Every alert of the sweep shares this one timestamp string
+        self.sweep_timestamp = datetime.now().isoformat()
+        self.wait_stats = {}
+        self.pagers = []
+        self.pending_hashes = {}
+        self.sweep_counts = {}
+        self.metrics.begin_run()
+
+    def create_pager(self, source, agency=None):
+        """Create a pagination controller for a source, seeded with its watermark"""
+        agency = agency or source
+        watermark = None
+        if self.incremental and SOURCE_SORT_ORDER.get(source) == 'desc':
+            watermark = (self.state.get('watermarks', agency) or {}).get('key')
+        pager = PaginationController(source, self.date_matcher, agency, watermark)
+        with self._lock:
+            self.pagers.append(pager)
+        return pager
+
+    def newest_keys(self):
+        """Keys of the newest alert each of the sweep's pagers has seen"""
+        with self._lock:
+            return {pager.newest_key for pager in self.pagers if pager.newest_key}
+
+    def commit_state(self, saved_keys):
+        """Persist watermarks whose newest alert was saved, and the content hashes"""
+        if not self.incremental:
+            return
+        for pager in self.pagers:
+            if pager.newest_key and pager.newest_key in saved_keys:
+                self.state.set('watermarks', pager.agency, {
+                    'key': pager.newest_key,
+                    'date': self.date_matcher.end.isoformat(),
+                    'updated': datetime.now().isoformat(),
+                })
+        for source, digest in self.pending_hashes.items():
+            self.state.set('content_hashes', source, digest)
+        self.state.save()
+
+    def content_digest(self, source):
+        """Hash the source's content fragment as rendered in the browser, or None if it is missing"""
+        fragment = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0])).map(e => e.outerHTML).join('')",
+            CONTENT_FRAGMENTS[source],
+        )
+        if not fragment:
+            return None
+        return hashlib.blake2b(fragment.encode('utf-8'), digest_size=16).hexdigest()
+
+    def content_unchanged(self, source, digest):
+        """Compare a digest with the last poll's hash, counting an unchanged poll in the source's metrics"""
+        unchanged = bool(digest) and self.incremental and self.state.get('content_hashes', source) == digest
+        if unchanged:
+            self.metrics.add('polls_unchanged', source=source)
+            logger.info(f"{source} unchanged since the last poll, skipping parse")
+        return unchanged
+
+    def remember_content(self, source, digest):
+        """Stage a source's content hash; it is persisted with the sweep's watermarks"""
+        if digest:
+            with self._lock:
+                self.pending_hashes[source] = digest
+
+    def get_current_date_str(self, day=None):
+        """Get the target date (or the given day) in various formats"""
+        day = day or self.date_matcher.end
+        return {
+            'dd-mm-yyyy': day.strftime('%d-%m-%Y'),
+            'yyyy-mm-dd': day.strftime('%Y-%m-%d'),
+            'dd/mm/yyyy': day.strftime('%d/%m/%Y'),
+            'mm/dd/yyyy': day.strftime('%m/%d/%Y'),
+            'dd-mmm-yyyy': day.strftime('%d-%b-%Y'),
+            'dd mmm yyyy': day.strftime('%d %b %Y'),
+        }
+
+    def get_window_start_str(self):
+        """Get the first date of the target window in various formats"""
+        return self.get_current_date_str(self.date_matcher.start)
+
+    def fetch_acuite_http(self):
+        """Fetch the Acuite live ratings table without a browser"""
+        logger.info("Fetching Acuite ratings over HTTP...")
+        session = self.get_http_session('Acuite')
+        response = self.http_request(session, 'GET', ACUITE_LIVE_RATINGS_URL, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return self.parse_acuite_html(response.text, self.create_pager('Acuite'))
+
+    def parse_acuite_html(self, html, pager):
+        """Parse a fetched Acuite live ratings page, or return None if it has no table"""
+        # The live ratings table ships every row in the initial HTML and is
+        # paginated client-side, so one request covers all pages
+        soup = self.parse_page(html, 'Acuite')
+        if not soup.find('table'):
+            return None
+        return self.extract_listing('Acuite', soup, pager)
+
+    def fetch_bse_http(self, max_pages=50):
+        """Fetch BSE announcements for the current date from the JSON API behind ann.html"""
+        logger.info("Fetching BSE announcements over HTTP...")
+        session = self.get_http_session('BSE')
+        alerts = []
+        
+        for segment in BSE_API_SEGMENTS:
+            pager = self.create_pager('BSE', f'BSE ({segment})')
             page_num = 1
-            while True:
-                logger.info(f"Processing SEBI page {page_num}")
-                
-                # Extract announcements from current page
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                announcement_rows = soup.find_all('tr')[1:]  # Skip header
-                
-                for row in announcement_rows:
-                    try:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            date_text = cells[0].get_text(strip=True) if cells else ""
-                            announcement_text = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                            
-                            if announcement_text and self.is_today_date(date_text):
-                                alerts.append({
-                                    'agency': 'SEBI',
-                                    'company': 'SEBI Announcement',
-                                    'date': date_text,
-                                    'action': announcement_text,
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                    except Exception as e:
-                        logger.warning(f"Error extracting SEBI announcement: {e}")
+            while page_num <= max_pages:
+                response = self.http_request(
+                    session,
+                    'GET',
+                    BSE_ANNOUNCEMENTS_API_URL,
+                    params=self.bse_api_params(segment, page_num),
+                    headers=BSE_API_HEADERS,
+                    timeout=HTTP_TIMEOUT,
+                )
+                response.raise_for_status()
+                data = response.json()
+                page_alerts = self.extract_bse_alerts(data, segment, pager)
+                if page_alerts is None:
+                    return None
+                alerts.extend(page_alerts)
                 
-                # Check for next page
-                try:
-                    next_button = self.driver.find_element(By.XPATH, "//a[contains(text(), 'Next')] | //input[@value='Next']")
-                    if next_button.is_enabled():
-                        next_button.click()
-                        time.sleep(3)
-                        page_num += 1
-                    else:
-                        break
-                except NoSuchElementException:
+                if page_num >= self.bse_page_count(data) or not pager.next_page():
                     break
+                page_num += 1
+        
+        return alerts
+
+    def bse_api_params(self, segment, page_num):
+        """Query parameters for one page of the BSE announcements API"""
+        return {
+            'pageno': page_num,
+            'strCat': '-1',
+            'strPrevDate': self.date_matcher.start.strftime('%Y%m%d'),
+            'strScrip': '',
+            'strSearch': 'P',
+            'strToDate': self.date_matcher.end.strftime('%Y%m%d'),
+            'strType': BSE_API_SEGMENTS[segment],
+            'subcategory': '-1',
+        }
+
+    def bse_page_count(self, data):
+        """Number of pages reported by a BSE announcements API response"""
+        rows = data.get('Table') or []
+        total_rows = (data.get('Table1') or [{}])[0].get('ROWCNT', 0)
+        if not rows:
+            return 0
+        return -(-total_rows // len(rows))
+
+    def extract_bse_alerts(self, data, segment, pager):
+        """Convert a BSE announcements API response into alerts, or None if the format is unknown"""
+        if not isinstance(data, dict) or 'Table' not in data:
+            return None
+        
+        current_date = self.get_current_date_str()['dd/mm/yyyy']
+        alerts = []
+        self.metrics.add('rows_scanned', len(data['Table'] or []))
+        for row in data['Table'] or []:
+            company_name = (row.get('SLONGNAME') or '').strip()
+            subject = (row.get('NEWSSUB') or row.get('HEADLINE') or '').strip()
+            # NEWS_DT looks like 2024-01-15T18:20:00.353
+            news_date_text = (row.get('NEWS_DT') or '')[:10]
+            news_date = self.date_matcher.parse(news_date_text)
+            pager.observe(news_date_text)
+            if company_name and self.on_watchlist(company_name, subject):
+                alert = Alert(
+                    agency=f'BSE ({segment})',
+                    company=company_name,
+                    date=news_date.strftime('%d/%m/%Y') if news_date else current_date,
+                    action=subject,
+                    timestamp=self.sweep_timestamp,
+                )
+                if row.get('SCRIP_CD'):
+                    alert['scrip_code'] = str(row['SCRIP_CD'])
+                if not pager.is_new(alert):
+                    break
+                alerts.append(alert)
+        return alerts
+
+    def fetch_nse_http(self):
+        """Fetch NSE announcements for the current date from the JSON API behind the filings page"""
+        logger.info("Fetching NSE announcements over HTTP...")
+        session = self.get_http_session('NSE')
+        current_date = self.get_current_date_str()['dd-mm-yyyy']
+        window_start = self.get_window_start_str()['dd-mm-yyyy']
+        
+        # The API only answers sessions that carry the cookies set by the site
+        if not session.cookies:
+            self.http_request(session, 'GET', NSE_ANNOUNCEMENTS_PAGE_URL, timeout=HTTP_TIMEOUT)
+        
+        alerts = []
+        for segment, index in NSE_API_SEGMENTS.items():
+            response = self.http_request(
+                session,
+                'GET',
+                NSE_ANNOUNCEMENTS_API_URL,
+                params={'index': index, 'from_date': window_start, 'to_date': current_date},
+                headers={'Referer': NSE_ANNOUNCEMENTS_PAGE_URL},
+                timeout=HTTP_TIMEOUT,
+            )
+            response.raise_for_status()
+            segment_alerts = self.extract_nse_alerts(response.json(), segment, self.create_pager('NSE', f'NSE ({segment})'))
+            if segment_alerts is None:
+                return None
+            alerts.extend(segment_alerts)
+        
+        return alerts
+
+    def extract_nse_alerts(self, rows, segment, pager):
+        """Convert an NSE announcements API response into alerts, or None if the format is unknown"""
+        if not isinstance(rows, list):
+            return None
+        
+        alerts = []
+        self.metrics.add('rows_scanned', len(rows))
+        for row in rows:
+            company_name = (row.get('sm_name') or row.get('symbol') or '').strip()
+            subject = (row.get('desc') or '').strip()
+            date_text = (row.get('an_dt') or '').strip()
+            if company_name and self.is_today_date(date_text) and self.on_watchlist(company_name, subject):
+                alert = Alert(
+                    agency=f'NSE ({segment})',
+                    company=company_name,
+                    date=date_text,
+                    action=subject,
+                    timestamp=self.sweep_timestamp,
+                )
+                if row.get('symbol'):
+                    alert['symbol'] = row['symbol'].strip()
+                if row.get('sm_isin'):
+                    alert['isin'] = row['sm_isin'].strip()
+                if not pager.is_new(alert):
+                    break
+                alerts.append(alert)
+        return alerts
+
+    def fetch_sebi_http(self, max_pages=10):
+        """Fetch the SEBI listing for the current date through its AJAX endpoint"""
+        logger.info("Fetching SEBI announcements over HTTP...")
+        session = self.get_http_session('SEBI')
+        pager = self.create_pager('SEBI')
+        alerts = []
+        
+        for page_index in range(max_pages):
+            response = self.http_request(
+                session,
+                'POST',
+                SEBI_LISTING_AJAX_URL,
+                data=self.sebi_listing_form(page_index),
+                headers={'Referer': SEBI_LISTING_URL},
+                timeout=HTTP_TIMEOUT,
+            )
+            response.raise_for_status()
             
-            logger.info(f"Found {len(alerts)} SEBI alerts")
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"Error scraping SEBI: {e}")
-            return []
+            page_alerts, has_next = self.parse_sebi_html(response.text, pager)
+            if page_alerts is None:
+                # A first page without a listing means the endpoint changed
+                return None if page_index == 0 else alerts
+            alerts.extend(page_alerts)
+            if not (has_next and pager.next_page()):
+                break
+        
+        return alerts
+
+    def sebi_listing_form(self, page_index):
+        """Form data for one page of the SEBI listing AJAX endpoint"""
+        return {
+            'nextValue': str(page_index),
+            'next': 'n',
+            'search': '',
+            'fromDate': self.get_window_start_str()['dd-mm-yyyy'],
+            'toDate': self.get_current_date_str()['dd-mm-yyyy'],
+            'fromYear': '',
+            'toYear': '',
+            'deptId': '-1',
+            'sid': '1',
+            'ssid': '1',
+            'smid': '1',
+            'ssidhidden': '1',
+            'intmid': '-1',
+            'sText': '',
+            'ssText': '',
+            'smText': '',
+            'doDirect': '-1',
+        }
+
+    def parse_sebi_html(self, html, pager):
+        """Parse one SEBI listing page into (alerts, has_next); alerts is None if there is no table"""
+        soup = self.parse_page(html, 'SEBI')
+        if not soup.find('table'):
+            return None, False
+        has_next = soup.find('a', string=lambda text: text and 'Next' in text) is not None
+        return self.extract_listing('SEBI', soup, pager), has_next
+
+    def extract_listing(self, source, soup, pager):
+        """Alerts in the date window from a listing page fetched without the browser, read as the source's browser flow reads it"""
+        config = load_source(source)
+        return config.hooks(config, self).extract(soup, pager, source)
 
     def extract_text_from_element(self, element, selectors):
         """Extract text from element using multiple selector strategies"""
-        for selector in selectors:
-            try:
-                # Try class name
-                found = element.find(class_=lambda x: x and selector in x.lower())
-                if found:
-                    return found.get_text(strip=True)
-                
-                # Try by text content
-                found = element.find(string=lambda text: text and selector in text.lower())
-                if found:
-                    return found.strip()
-                
-                # Try by tag with text
-                for tag in ['span', 'div', 'td', 'p', 'a']:
-                    found = element.find(tag, string=lambda text: text and selector in text.lower())
-                    if found:
-                        return found.get_text(strip=True)
-                        
-            except Exception:
-                continue
-        return ""
+        key = tuple(selectors)
+        plan = self.selector_plans.get(key)
+        if plan is None:
+            plan = self.selector_plans[key] = FieldExtractor({'text': selectors})
+        return plan.extract(element)['text']
 
     def is_today_date(self, date_text):
-        """Check if the given date text represents today's date"""
-        if not date_text:
-            return False
-            
-        today = datetime.now()
-        today_formats = [
-            today.strftime('%d-%m-%Y'),
-            today.strftime('%Y-%m-%d'),
-            today.strftime('%d/%m/%Y'),
-            today.strftime('%m/%d/%Y'),
-            today.strftime('%d-%b-%Y'),
-            today.strftime('%d %b %Y'),
-            today.strftime('%d %B %Y'),
-        ]
-        
-        # Clean the date text
-        cleaned_date = date_text.strip().replace(',', '')
-        
-        return any(fmt in cleaned_date for fmt in today_formats)
+        """Check if the given date text represents a date in the sweep's target window"""
+        return self.date_matcher.matches(date_text)
 
-    def run_all_scrapers(self):
-        """Run all rating agency scrapers"""
+    def source_configs(self, only=None):
+        """Configs of the enabled sources, or only the named ones, in report order; sources that fail to load are skipped"""
+        names = enabled_sources() if only is None else [name for name in SOURCE_REGISTRY if name in only]
+        configs = []
+        for name in names:
+            try:
+                configs.append(load_source(name))
+            except Exception as e:
+                logger.error(f"Error loading source {name}: {e}")
+        return configs
+
+    def browser_scraper(self, config):
+        """The Selenium scraper of a source, run by its hooks class"""
+        return config.hooks(config, self).scrape
+
+    def source_scraper(self, config):
+        """The scraper a sweep runs for a source: its HTTP fast path falling back to the browser, or just the browser"""
+        scraper = self.browser_scraper(config)
+        if config.http:
+            return functools.partial(self.scrape_with_fallback, config.name, getattr(self, config.http), scraper)
+        return scraper
+
+    def run_all_scrapers(self, only=None):
+        """Run all rating agency scrapers, or only the named ones"""
         logger.info("Starting rating agency alerts collection...")
+        sweep_start = time.monotonic()
+        self.begin_sweep()
+        pipeline = AlertPipeline(self)
         
-        all_alerts = []
-        
-        # Define scrapers
-        scrapers = [
-            ('ICRA', self.scrape_icra_ratings),
-            ('CareEdge', self.scrape_careedge_ratings),
-            ('Acuite', self.scrape_acuite_ratings),
-            ('CRISIL', self.scrape_crisil_ratings),
-            ('BSE', self.scrape_bse_announcements),
-            ('NSE', self.scrape_nse_announcements),
-            ('SEBI', self.scrape_sebi_announcements),
-        ]
+        scrapers = [(config.name, self.source_scraper(config)) for config in self.source_configs(only)]
+        
+        # Each scraper runs on its own worker thread with its own driver and
+        # feeds the pipeline page by page, so alerts are stored and notified
+        # while the other scrapers are still browsing
+        with ThreadPoolExecutor(max_workers=self.max_drivers, thread_name_prefix='scraper') as executor:
+            futures = [
+                (agency_name, executor.submit(self.run_scraper, agency_name, scraper_func, pipeline))
+                for agency_name, scraper_func in scrapers
+            ]
+            
+            for agency_name, future in futures:
+                try:
+                    found = future.result()
+                    self.sweep_counts[agency_name] = found
+                    logger.info(f"Completed {agency_name}: {found} alerts")
+                except Exception as e:
+                    logger.error(f"Error running {agency_name} scraper: {e}")
         
-        for agency_name, scraper_func in scrapers:
+        return self.finish_sweep(pipeline, sweep_start)
+
+    def load_watchlist(self, path):
+        """Watchlist matcher built from the watchlist file, or None to keep every company"""
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            names = [line.split('#', 1)[0].strip() for line in f]
+        matcher = WatchlistMatcher(name for name in names if name)
+        logger.info(f"Watching {matcher.size} companies from {path}")
+        return matcher
+
+    def on_watchlist(self, *texts):
+        """Whether any of the texts (company, action) mentions a watched company; always true without a watchlist"""
+        if self.watchlist is None:
+            return True
+        return any(text and self.watchlist.search(text) for text in texts)
+
+    def load_entities(self, path):
+        """Entity index from the NBFC master file, or an empty one if there is none"""
+        if path and os.path.exists(path):
             try:
-                logger.info(f"Running {agency_name} scraper...")
-                agency_alerts = scraper_func()
-                all_alerts.extend(agency_alerts)
-                logger.info(f"Completed {agency_name}: {len(agency_alerts)} alerts")
-                
-                # Small delay between agencies
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"Error running {agency_name} scraper: {e}")
+                entities = EntityIndex.from_csv(path)
+                logger.info(f"Loaded {len(entities.labels)} NBFC entities from {path}")
+                return entities
+            except (OSError, KeyError, csv.Error) as e:
+                logger.error(f"Error loading NBFC entities from {path}: {e}")
+        return EntityIndex()
+
+    def resolve_entities(self, alerts):
+        """Tag alerts with the canonical id of their company, where it is known"""
+        for alert in alerts:
+            codes = [alert.get('isin'), alert.get('symbol'), alert.get('scrip_code')]
+            entity_id = self.entities.resolve(alert['company'], codes)
+            if entity_id:
+                alert['entity_id'] = entity_id
+        return alerts
+
+    def finish_sweep(self, pipeline, sweep_start):
+        """Drain the sweep's pipeline, export its events and persist scraper state; returns the deduplicated events"""
+        events = pipeline.close()
+        logger.info(f"Total alerts found: {pipeline.count} in {time.monotonic() - sweep_start:.1f}s")
+        if pipeline.first_event_seconds is not None:
+            logger.info(f"First new event delivered after {pipeline.first_event_seconds:.1f}s")
+        logger.info(f"Stored {pipeline.inserted} new alerts in {self.alert_store.path}")
+        
+        if self.json_export:
+            filename = self.save_alerts(events)
+            logger.info(f"Alerts saved to: {filename}")
         
-        # Save alerts to file
+        self.commit_state(pipeline.saved_newest)
+        self.report_metrics()
+        return events
+
+    def report_metrics(self):
+        """Log the sweep's per-scraper summary and refresh the Prometheus textfile"""
+        logger.info(f"Scraper metrics for this sweep:\n{self.metrics.summary_table()}")
+        if self.metrics_path:
+            try:
+                self.metrics.write_prometheus(self.metrics_path)
+            except OSError as e:
+                logger.error(f"Error writing metrics to {self.metrics_path}: {e}")
+
+    def query_alerts(self, agency=None, segment=None, company=None, company_like=None,
+                     start_date=None, end_date=None, limit=None):
+        """Look up stored alerts by agency/segment, company and date range (inclusive)"""
+        return self.alert_store.query(
+            agency=agency, segment=segment, company=company, company_like=company_like,
+            start_date=start_date, end_date=end_date, limit=limit,
+        )
+
+    def company_history(self, company, start_date=None, end_date=None):
+        """All stored alerts whose company name contains the given text, newest first"""
+        return self.alert_store.query(company_like=company, start_date=start_date, end_date=end_date)
+
+    def load_alert_history(self, start_date=None, end_date=None, agencies=None, columns=None):
+        """Archived alerts as a DataFrame, e.g. load_alert_history(date(2024, 1, 1), agencies=['CRISIL'], columns=['date', 'company', 'rating'])"""
+        if not self.alert_archive:
+            raise RuntimeError("Parquet archive is disabled")
+        return self.alert_archive.load(start_date=start_date, end_date=end_date, agencies=agencies, columns=columns)
+
+    def save_alerts(self, all_alerts):
+        """Save alerts to a timestamped JSON file and return its name"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"rating_alerts_{timestamp}.json"
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(all_alerts, f, indent=2, ensure_ascii=False)
+            json.dump(all_alerts, f, indent=2, ensure_ascii=False, default=Alert.to_dict)
         
-        logger.info(f"Total alerts found: {len(all_alerts)}")
-        logger.info(f"Alerts saved to: {filename}")
-        
-        return all_alerts
+        return filename
+
+    def run_scraper(self, agency_name, scraper_func, pipeline=None):
+        """Run a single scraper on the calling thread, feeding each page it yields to the pipeline; returns its alert count"""
+        logger.info(f"Running {agency_name} scraper...")
+        token = current_source.set(agency_name)
+        found = 0
+        try:
+            with self.metrics.timer('duration_seconds'):
+                for page_alerts in scraper_func():
+                    self.metrics.add('rows_matched', len(page_alerts))
+                    if pipeline:
+                        pipeline.feed(page_alerts)
+                    found += len(page_alerts)
+            return found
+        finally:
+            self.release_driver()
+            current_source.reset(token)
 
     def generate_alert_report(self, alerts):
         """Generate a formatted report of all alerts"""
@@ -623,7 +2643,7 @@ class RatingAgencyAlertSystem:
         
         report = []
         report.append("=" * 60)
-        report.append(f"RATING AGENCY ALERTS - {datetime.now().strftime('%d %B %Y')}")
+        report.append(f"RATING AGENCY ALERTS - {self.date_matcher.end.strftime('%d %B %Y')}")
         report.append("=" * 60)
         report.append("")
         
@@ -643,36 +2663,496 @@ class RatingAgencyAlertSystem:
                 report.append(f"Company: {alert['company']}")
                 report.append(f"Date: {alert['date']}")
                 report.append(f"Action: {alert['action']}")
+                if len(alert.get('sources', [])) > 1:
+                    report.append(f"Also reported by: {', '.join(alert['sources'][1:])}")
                 report.append("")
             
             report.append("")
         
+        # Group alerts by company, so one NBFC reported under several names shows up once
+        by_company = {}
+        for alert in alerts:
+            entity = alert.get('entity_id') or normalize_company(alert['company'])
+            if entity not in by_company:
+                by_company[entity] = []
+            by_company[entity].append(alert)
+        
+        report.append(f"COMPANIES ({len(by_company)}):")
+        report.append("-" * 30)
+        for entity, company_alerts in by_company.items():
+            name = self.entities.label(entity) if company_alerts[0].get('entity_id') else company_alerts[0]['company']
+            sources = []
+            for alert in company_alerts:
+                for source in alert.get('sources', [alert['agency']]):
+                    if source not in sources:
+                        sources.append(source)
+            report.append(f"{name}: {len(company_alerts)} alerts ({', '.join(sources)})")
+        report.append("")
+        
         return "\n".join(report)
 
     def cleanup(self):
         """Cleanup resources"""
-        if self.driver:
-            self.driver.quit()
+        for session in self.http_sessions.values():
+            session.close()
+        self.driver_pool.close()
+        self.alert_store.close()
+        logger.removeHandler(self.metrics_log_handler)
+        if self.alert_stream:
+            self.alert_stream.close()
+
+class AsyncRatingAgencyAlertSystem(RatingAgencyAlertSystem):
+    """Asyncio variant that fetches every HTTP-capable source and its pages concurrently"""
+    def __init__(self, max_connections=20, parse_workers=4, **kwargs):
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.parse_executor = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix='parser')
+        self.browser_executor = ThreadPoolExecutor(max_workers=self.max_drivers, thread_name_prefix='scraper')
+        self.host_limits = {}
+
+    def host_semaphore(self, url):
+        """Semaphore bounding concurrent requests to the host of url"""
+        host = urlsplit(url).hostname
+        semaphore = self.host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+            self.host_limits[host] = semaphore
+        return semaphore
+
+    async def fetch(self, session, method, url, as_json=False, **kwargs):
+        """Fetch a URL on the shared session, respecting the per-host limit"""
+        async with self.host_semaphore(url):
+            start = time.monotonic()
+            async with session.request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                body = await response.read()
+                encoding = response.get_encoding()
+            self.metrics.add('page_load_seconds', time.monotonic() - start)
+            self.metrics.add('pages_visited')
+            self.metrics.add('page_bytes', len(body))
+            text = body.decode(encoding)
+            return json.loads(text) if as_json else text
+
+    async def parse(self, func, *args):
+        """Run a parsing function on the parser thread pool so the event loop never blocks"""
+        loop = asyncio.get_running_loop()
+        # Carry the current source over to the worker thread for metrics
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.parse_executor, functools.partial(context.run, func, *args))
+
+    async def fetch_acuite_async(self, session):
+        """Fetch the Acuite live ratings table"""
+        html = await self.fetch(session, 'GET', ACUITE_LIVE_RATINGS_URL)
+        return await self.parse(self.parse_acuite_html, html, self.create_pager('Acuite'))
+
+    async def fetch_sebi_async(self, session, max_pages=10):
+        """Fetch SEBI listing pages for the current date a window at a time"""
+        pager = self.create_pager('SEBI')
+        alerts = []
+        
+        for window_start in range(0, max_pages, SEBI_PAGE_WINDOW):
+            page_indexes = range(window_start, min(window_start + SEBI_PAGE_WINDOW, max_pages))
+            pages = await asyncio.gather(*(
+                self.fetch(
+                    session, 'POST', SEBI_LISTING_AJAX_URL,
+                    data=self.sebi_listing_form(page_index),
+                    headers={'Referer': SEBI_LISTING_URL},
+                )
+                for page_index in page_indexes
+            ))
+            
+            for page_index, html in zip(page_indexes, pages):
+                page_alerts, has_next = await self.parse(self.parse_sebi_html, html, pager)
+                if page_alerts is None:
+                    return None if page_index == 0 else alerts
+                alerts.extend(page_alerts)
+                if not (has_next and pager.next_page()):
+                    return alerts
+        
+        return alerts
+
+    async def fetch_bse_segment_async(self, session, segment, max_pages=50):
+        """Fetch the first BSE page for a segment, then every remaining page concurrently"""
+        def get_page(page_num):
+            return self.fetch(
+                session, 'GET', BSE_ANNOUNCEMENTS_API_URL, as_json=True,
+                params=self.bse_api_params(segment, page_num),
+                headers=BSE_API_HEADERS,
+            )
+        
+        pager = self.create_pager('BSE', f'BSE ({segment})')
+        first_page = await get_page(1)
+        alerts = await self.parse(self.extract_bse_alerts, first_page, segment, pager)
+        if alerts is None:
+            return None
+        if not pager.next_page():
+            return alerts
+        
+        page_count = min(self.bse_page_count(first_page), max_pages)
+        pages = await asyncio.gather(*(get_page(n) for n in range(2, page_count + 1)))
+        for data in pages:
+            page_alerts = await self.parse(self.extract_bse_alerts, data, segment, pager)
+            if page_alerts is None:
+                return None
+            alerts.extend(page_alerts)
+            if not pager.next_page():
+                break
+        return alerts
+
+    async def fetch_bse_async(self, session):
+        """Fetch BSE announcements for all segments concurrently"""
+        results = await asyncio.gather(*(
+            self.fetch_bse_segment_async(session, segment) for segment in BSE_API_SEGMENTS
+        ))
+        if any(result is None for result in results):
+            return None
+        return [alert for result in results for alert in result]
+
+    async def fetch_nse_async(self, session):
+        """Fetch NSE announcements for all segments concurrently"""
+        current_date = self.get_current_date_str()['dd-mm-yyyy']
+        window_start = self.get_window_start_str()['dd-mm-yyyy']
+        
+        # The API only answers sessions that carry the cookies set by the site
+        if not any(cookie.key for cookie in session.cookie_jar):
+            await self.fetch(session, 'GET', NSE_ANNOUNCEMENTS_PAGE_URL)
+        
+        responses = await asyncio.gather(*(
+            self.fetch(
+                session, 'GET', NSE_ANNOUNCEMENTS_API_URL, as_json=True,
+                params={'index': index, 'from_date': window_start, 'to_date': current_date},
+                headers={'Referer': NSE_ANNOUNCEMENTS_PAGE_URL},
+            )
+            for index in NSE_API_SEGMENTS.values()
+        ))
+        
+        alerts = []
+        for segment, rows in zip(NSE_API_SEGMENTS, responses):
+            segment_alerts = await self.parse(self.extract_nse_alerts, rows, segment, self.create_pager('NSE', f'NSE ({segment})'))
+            if segment_alerts is None:
+                return None
+            alerts.extend(segment_alerts)
+        return alerts
+
+    async def run_source(self, session, agency_name, fetcher, fallback, pipeline):
+        """Run one source over HTTP, or on the browser pool if it has no HTTP path or the fetch fails"""
+        # Each source runs in its own task, so this only tags this source's work
+        current_source.set(agency_name)
+        if fetcher:
+            try:
+                start = time.monotonic()
+                alerts = await fetcher(session)
+                self.metrics.add('duration_seconds', time.monotonic() - start)
+                if alerts is not None:
+                    logger.info(f"Found {len(alerts)} {agency_name} alerts via HTTP")
+                    self.metrics.add('rows_matched', len(alerts))
+                    pipeline.feed(alerts)
+                    return len(alerts)
+                logger.info(f"{agency_name} HTTP response had no usable listing, falling back to Selenium")
+            except Exception as e:
+                logger.warning(f"{agency_name} HTTP fast path failed, falling back to Selenium: {e}")
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.browser_executor, self.run_scraper, agency_name, fallback, pipeline)
+
+    async def run_all_scrapers(self, only=None):
+        """Run all rating agency scrapers, or only the named ones, concurrently on one event loop"""
+        logger.info("Starting async rating agency alerts collection...")
+        sweep_start = time.monotonic()
+        self.begin_sweep()
+        self.host_limits = {}
+        pipeline = AlertPipeline(self)
+        
+        # (agency, async HTTP fetcher, browser scraper) in report order
+        sources = [
+            (config.name, getattr(self, config.async_http) if config.async_http else None, self.browser_scraper(config))
+            for config in self.source_configs(only)
+        ]
+        
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT * 4, sock_read=HTTP_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HTTP_HEADERS) as session:
+            results = await asyncio.gather(
+                *(self.run_source(session, name, fetcher, fallback, pipeline) for name, fetcher, fallback in sources),
+                return_exceptions=True,
+            )
+        
+        for (agency_name, _, _), result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error running {agency_name} scraper: {result}")
+                continue
+            self.sweep_counts[agency_name] = result
+            logger.info(f"Completed {agency_name}: {result} alerts")
+        
+        return self.finish_sweep(pipeline, sweep_start)
+
+    def cleanup(self):
+        """Cleanup resources"""
+        self.parse_executor.shutdown(wait=False)
+        self.browser_executor.shutdown(wait=False)
+        super().cleanup()
+
+def daemon_authkey(create=False):
+    """Shared secret between the browser daemon and its clients, or None if there is none yet"""
+    # Connections exchange pickles, so the key must never be guessable; without
+    # the environment variable the daemon creates a random one on first start
+    key = os.environ.get(BROWSER_DAEMON_KEY_ENV)
+    if key:
+        return key.encode('utf-8')
+    if create and not os.path.exists(BROWSER_DAEMON_KEY_PATH):
+        try:
+            fd = os.open(BROWSER_DAEMON_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(secrets.token_hex(32))
+            logger.info(f"Created browser daemon key {BROWSER_DAEMON_KEY_PATH}")
+        except FileExistsError:
+            pass
+    try:
+        info = os.stat(BROWSER_DAEMON_KEY_PATH)
+    except FileNotFoundError:
+        return None
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{BROWSER_DAEMON_KEY_PATH} must be owned by you and not readable by others (chmod 600)")
+    with open(BROWSER_DAEMON_KEY_PATH, encoding='utf-8') as f:
+        return f.read().strip().encode('utf-8')
+
+def parse_address(text):
+    """('host', port) from 'host:port'"""
+    host, port = text.rsplit(':', 1)
+    return host, int(port)
+
+class BrowserDaemon:
+    """Long-lived worker keeping warm drivers, cookies and HTTP sessions, running sweep jobs from a local socket"""
+    def __init__(self, alert_system, address=BROWSER_DAEMON_ADDRESS):
+        self.alert_system = alert_system
+        self.address = parse_address(address)
+
+    def serve_forever(self):
+        """Accept jobs until a shutdown job arrives"""
+        with Listener(self.address, authkey=daemon_authkey(create=True)) as listener:
+            logger.info(f"Browser daemon listening on {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected browser daemon connection: {e}")
+                    continue
+                with conn:
+                    try:
+                        job = conn.recv()
+                    except EOFError:
+                        continue
+                    if job.get('command') == 'shutdown':
+                        conn.send({'ok': True})
+                        logger.info("Browser daemon shutting down")
+                        return
+                    conn.send(self.handle(job))
+
+    def handle(self, job):
+        """Run one sweep job and return its alerts and report"""
+        if job.get('command') != 'sweep':
+            return {'ok': False, 'error': f"unknown command {job.get('command')!r}"}
+        try:
+            self.alert_system.set_window(job.get('target_date'), job.get('window_days', 0))
+            alerts = self.alert_system.run_all_scrapers(only=job.get('sources'))
+            return {'ok': True, 'alerts': alerts, 'report': self.alert_system.generate_alert_report(alerts)}
+        except Exception as e:
+            logger.error(f"Error running sweep job: {e}")
+            return {'ok': False, 'error': str(e)}
+
+def request_sweep(address=BROWSER_DAEMON_ADDRESS, target_date=None, window_days=0, sources=None):
+    """Have a running browser daemon do a sweep; returns its response, or None if no daemon could be reached"""
+    try:
+        authkey = daemon_authkey()
+        if authkey is None:
+            return None
+        with Client(parse_address(address), authkey=authkey) as conn:
+            conn.send({'command': 'sweep', 'target_date': target_date, 'window_days': window_days, 'sources': sources})
+            return conn.recv()
+    except (OSError, EOFError, AuthenticationError) as e:
+        logger.warning(f"Could not reach the browser daemon at {address}: {e}")
+        return None
+
+# Daemon mode polling: starting interval per source in seconds (sources not
+# listed start at the default), the bounds intervals adapt within, and how
+# they move after a poll with or without news
+SCHEDULE_BASE_INTERVALS = {
+    'ICRA': 900,
+    'CareEdge': 900,
+    'Acuite': 1800,
+    'CRISIL': 900,
+    'BSE': 300,
+    'NSE': 300,
+    'SEBI': 1800,
+}
+SCHEDULE_DEFAULT_INTERVAL = 1800
+SCHEDULE_MIN_INTERVAL = 120
+SCHEDULE_MAX_INTERVAL = 4 * 3600
+SCHEDULE_BACKOFF = 1.5
+SCHEDULE_SPEEDUP = 0.5
+# A poll that failed is retried after at most this long, without changing the source's interval
+SCHEDULE_RETRY_INTERVAL = 300
+SCHEDULE_JITTER = 0.1
+
+# Exchange sources are polled at least this often while the market is open (IST, Monday-Friday)
+MARKET_HOURS_SOURCES = {'BSE', 'NSE'}
+MARKET_HOURS_INTERVAL = 180
+MARKET_OPEN = dt_time(9, 0)
+MARKET_CLOSE = dt_time(15, 30)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+def market_open(now=None):
+    """Whether Indian exchanges are in trading hours"""
+    now = now or datetime.now(IST)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+def poll_outcome(alert_system, source):
+    """Whether the last sweep found alerts at a source, or None if its scraper raised or logged errors without finding any"""
+    found = alert_system.sweep_counts.get(source)
+    if found is None or (not found and alert_system.metrics.run.get(source, {}).get('errors')):
+        return None
+    return found > 0
+
+class AdaptiveScheduler:
+    """Per-source polling intervals that back off while a source is quiet and tighten when it has news"""
+    def __init__(self, sources=None, clock=time.monotonic):
+        self.clock = clock
+        self.intervals = {
+            source: SCHEDULE_BASE_INTERVALS.get(source, SCHEDULE_DEFAULT_INTERVAL)
+            for source in (enabled_sources() if sources is None else sources)
+        }
+        now = clock()
+        self.next_run = {source: now for source in self.intervals}
 
-def main():
+    def due(self):
+        """Sources whose next poll time has passed"""
+        now = self.clock()
+        return [source for source, at in self.next_run.items() if at <= now]
+
+    def delay(self, source):
+        """Seconds until the next poll of a source, with market-hours tightening and jitter"""
+        interval = self.intervals[source]
+        if source in MARKET_HOURS_SOURCES and market_open():
+            interval = min(interval, MARKET_HOURS_INTERVAL)
+        return interval * random.uniform(1 - SCHEDULE_JITTER, 1 + SCHEDULE_JITTER)
+
+    def record(self, source, changed):
+        """Adapt a source's interval to whether its last poll found anything new and schedule the next one; changed is None for a failed poll"""
+        interval = self.intervals[source]
+        if changed is None:
+            # A failed poll says nothing about how active the source is, so keep its interval and retry soon
+            delay = min(self.delay(source), SCHEDULE_RETRY_INTERVAL)
+            self.next_run[source] = self.clock() + delay
+            logger.info(f"Next {source} poll in {delay / 60:.1f} min (failed)")
+            return
+        if changed:
+            interval = max(SCHEDULE_MIN_INTERVAL, interval * SCHEDULE_SPEEDUP)
+        else:
+            interval = min(SCHEDULE_MAX_INTERVAL, interval * SCHEDULE_BACKOFF)
+        self.intervals[source] = interval
+        delay = self.delay(source)
+        self.next_run[source] = self.clock() + delay
+        logger.info(f"Next {source} poll in {delay / 60:.1f} min ({'changed' if changed else 'unchanged'})")
+
+    def seconds_until_next(self):
+        """Time to sleep before any source is due"""
+        return max(0.0, min(self.next_run.values()) - self.clock())
+
+    def run_forever(self, alert_system):
+        """Poll due sources until interrupted, saving a report whenever new events turn up"""
+        logger.info(f"Scheduler started for {', '.join(self.intervals)}")
+        while True:
+            due = self.due()
+            if due:
+                try:
+                    events = alert_system.run_all_scrapers(only=due)
+                except Exception as e:
+                    logger.error(f"Error in scheduled sweep of {', '.join(due)}: {e}")
+                    events = []
+                for source in due:
+                    self.record(source, poll_outcome(alert_system, source))
+                new_events = [event for event in events if event.get('new')]
+                if new_events:
+                    save_report(alert_system.generate_alert_report(new_events))
+            time.sleep(self.seconds_until_next())
+
+def save_report(report):
+    """Print the report and save it to a timestamped file"""
+    print(report)
+    
+    report_filename = f"rating_alerts_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    with open(report_filename, 'w', encoding='utf-8') as f:
+        f.write(report)
+    
+    logger.info(f"Report saved to: {report_filename}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Collect rating agency and exchange alerts for NBFCs")
+    parser.add_argument('--date', type=date.fromisoformat, help="target date as YYYY-MM-DD (default: today)")
+    parser.add_argument('--window-days', type=int, default=0, help="also accept this many days before the target date")
+    parser.add_argument('--db', default=ALERT_DB_PATH, help="SQLite alert store (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="also write each sweep to rating_alerts_<timestamp>.json")
+    parser.add_argument('--stream-dir', default=ALERT_STREAM_DIR, help="directory of daily JSONL alert segments (default: %(default)s)")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="partitioned Parquet alert history (default: %(default)s)")
+    parser.add_argument('--full-browser', action='store_true', help="load images, media and trackers in Chrome instead of the lean mode")
+    parser.add_argument('--watchlist', default=WATCHLIST_PATH, help="only keep alerts mentioning a company listed here (default: %(default)s)")
+    parser.add_argument('--entities', default=NBFC_ENTITIES_PATH, help="NBFC master CSV used to resolve company names (default: %(default)s)")
+    parser.add_argument('--metrics-file', default=METRICS_PATH, help="Prometheus textfile refreshed after every sweep (default: %(default)s)")
+    parser.add_argument('--metrics-port', type=int, help="also serve the metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--daemon', action='store_true', help="keep running and poll each source on its own adaptive schedule")
+    parser.add_argument('--browser-daemon', action='store_true', help="stay running and serve sweep jobs with warm browsers")
+    parser.add_argument('--use-browser-daemon', action='store_true', help="send the sweep to a running browser daemon, falling back to a local run")
+    parser.add_argument('--daemon-address', default=BROWSER_DAEMON_ADDRESS, help="host:port of the browser daemon (default: %(default)s)")
+    parser.add_argument('--driver-max-uses', type=int, default=DRIVER_MAX_USES, help="restart a driver after this many scraper runs")
+    parser.add_argument('--driver-max-rss-mb', type=int, default=DRIVER_MAX_RSS_MB, help="restart a driver whose Chrome processes use more memory than this")
+    parser.add_argument('--sources', type=lambda text: text.split(','), help=f"comma-separated sources to run, out of {', '.join(SOURCE_REGISTRY)} (default: the enabled ones)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to run the alert system"""
-    alert_system = RatingAgencyAlertSystem()
+    args = parse_args(argv)
+    if args.use_browser_daemon:
+        response = request_sweep(args.daemon_address, args.date, args.window_days, args.sources)
+        if response and response['ok']:
+            save_report(response['report'])
+            return
+        logger.warning(f"Browser daemon sweep unavailable ({response['error'] if response else 'not running'}), running locally")
+    
+    alert_system = RatingAgencyAlertSystem(
+        target_date=args.date,
+        window_days=args.window_days,
+        alert_db_path=args.db,
+        json_export=args.json,
+        stream_dir=args.stream_dir,
+        archive_dir=args.archive_dir,
+        entities_path=args.entities,
+        watchlist_path=args.watchlist,
+        lean_browser=not args.full_browser,
+        driver_max_uses=args.driver_max_uses,
+        driver_max_rss_mb=args.driver_max_rss_mb,
+        metrics_path=args.metrics_file,
+    )
+    if args.metrics_port:
+        serve_metrics(alert_system.metrics, args.metrics_port)
     
     try:
-        # Run all scrapers
-        alerts = alert_system.run_all_scrapers()
-        
-        # Generate and print report
-        report = alert_system.generate_alert_report(alerts)
-        print(report)
+        if args.browser_daemon:
+            BrowserDaemon(alert_system, args.daemon_address).serve_forever()
+            return
+        if args.daemon:
+            AdaptiveScheduler(args.sources).run_forever(alert_system)
+            return
         
-        # Save report to file
-        report_filename = f"rating_alerts_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(report_filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        # Run all scrapers
+        alerts = alert_system.run_all_scrapers(only=args.sources)
         
-        logger.info(f"Report saved to: {report_filename}")
+        # Generate, print and save report
+        save_report(alert_system.generate_alert_report(alerts))
         
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+    
     except Exception as e:
         logger.error(f"Error in main execution: {e}")
     
@@ -680,4 +3160,6 @@ def main():
         alert_system.cleanup()
 
 if __name__ == "__main__":
+    # Source plugins import this module as "app"; let them share the running copy
+    sys.modules.setdefault('app', sys.modules[__name__])
     main()
@@ -0,0 +1,55 @@
+"""Measure page-load time and Chrome memory for the full and lean browser modes
+
+Usage:
+    python benchmarks/bench_browser.py [--sources ICRA,CRISIL,...] [--repeat N]
+
+Needs Chrome and network access to the agency sites. For each source the page
+is loaded --repeat times in a fresh full browser and then in a fresh lean one;
+the best driver.get() time and the resident memory of the whole Chrome process
+tree (from /proc, so Linux only) after the last load are reported.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_chrome_driver, enabled_sources, load_source, process_tree_rss
+
+def measure(url, lean, repeat):
+    """Best load time in seconds and Chrome RSS in bytes for one browser mode, or None without Chrome"""
+    driver = create_chrome_driver(lean=lean)
+    if driver is None:
+        return None
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            driver.get(url)
+            best = min(best, time.perf_counter() - start)
+        return best, process_tree_rss(driver.service.process.pid)
+    finally:
+        driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', default=','.join(enabled_sources()), help='comma-separated sources to load')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'source':<13} {'full ms':>9} {'lean ms':>9} {'saved ms':>9} {'full MiB':>9} {'lean MiB':>9} {'saved MiB':>10}")
+    for source in args.sources.split(','):
+        url = load_source(source).url
+        full = measure(url, False, args.repeat)
+        lean = measure(url, True, args.repeat)
+        if full is None or lean is None:
+            sys.exit("Chrome could not be started")
+        (full_time, full_rss), (lean_time, lean_rss) = full, lean
+        print(
+            f"{source:<13} {full_time * 1000:>9.0f} {lean_time * 1000:>9.0f} {(full_time - lean_time) * 1000:>9.0f} "
+            f"{full_rss / 2**20:>9.0f} {lean_rss / 2**20:>9.0f} {(full_rss - lean_rss) / 2**20:>10.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark full html.parser trees against lxml + SoupStrainer trees
+
+Usage:
+    python benchmarks/bench_parsing.py [--pages DIR] [--rows N] [--repeat N]
+
+With --pages, every DIR/<SITE>*.html file (e.g. ICRA_page1.html saved from
+driver.page_source) is benchmarked; otherwise synthetic pages are used.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup
+
+from app import parse_html
+from synthetic import SITES, make_rows, site_page
+
+def load_pages(pages_dir, rows):
+    """(site, label, html) for saved pages, or synthetic ones if no directory is given"""
+    if not pages_dir:
+        return [(site, f'synthetic {rows} rows', site_page(site, make_rows(rows), has_next=True)) for site in SITES]
+    pages = []
+    for site in SITES:
+        for path in sorted(glob.glob(os.path.join(pages_dir, f'{site}*.html'))):
+            with open(path, encoding='utf-8') as f:
+                pages.append((site, os.path.basename(path), f.read()))
+    return pages
+
+def measure(func, repeat):
+    """Best wall time over repeat runs and peak traced memory of one run"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', help='directory of saved page sources named <SITE>*.html')
+    parser.add_argument('--rows', type=int, default=500, help='rows per synthetic page')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'site':<9} {'page':<22} {'KiB':>7} {'html.parser ms':>15} {'lxml+strainer ms':>17} {'speedup':>8} {'peak MiB before':>16} {'after':>7}")
+    for site, label, html in load_pages(args.pages, args.rows):
+        before_time, before_peak = measure(lambda: BeautifulSoup(html, 'html.parser'), args.repeat)
+        after_time, after_peak = measure(lambda: parse_html(html, site), args.repeat)
+        print(
+            f"{site:<9} {label[:22]:<22} {len(html) / 1024:>7.0f} {before_time * 1000:>15.1f} {after_time * 1000:>17.1f} "
+            f"{before_time / after_time:>7.1f}x {before_peak / 2**20:>16.1f} {after_peak / 2**20:>7.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""Time the parsing, extraction, date matching, scraper row loops, alerts and report at growing page sizes
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 100,1000,10000,100000] [--repeat N]
+                                     [--corpus DIR] [--baseline FILE] [--save-baseline]
+                                     [--tolerance 0.25]
+
+Every case runs on synthetic pages of each size, and --corpus adds a replay of
+a corpus recorded with benchmarks/fixtures.py. For each case the best time
+over --repeat runs, the row throughput and the peak traced memory of one more
+run are printed and compared with the baseline file. The exit status is 1 if
+any case got slower or used more memory than the baseline by more than
+--tolerance. Timings only compare on the machine the baseline was saved on,
+so save benchmarks/baseline.json with --save-baseline on the machine that runs
+the sweeps, and again after changing hardware or accepting a slowdown.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup
+
+from app import FIELD_PLANS, Alert, load_source, parse_html
+from bench_extraction import make_row_html
+from fixtures import ReplaySystem, isolated_paths, load_corpus
+from synthetic import SITES, make_rows, render_date, site_page
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# Share of synthetic rows dated today; the rest are older, so the scrapers'
+# date-ordered early exits are exercised too
+TODAY_SHARE = 0.5
+
+# Cases faster than this are too noisy for a relative comparison
+MIN_COMPARED_SECONDS = 0.005
+
+def measure(func, repeat):
+    """Best wall time over repeat runs, peak traced memory of one more run, and func's last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def synthetic_corpus(rows):
+    """In-memory replay corpus with one page per site"""
+    sources, pages = {}, {}
+    for site in SITES:
+        pages[f'{site}.html'] = site_page(site, make_rows(rows, today_share=TODAY_SHARE))
+        sources[site] = {'snapshots': [{'ordinal': 0, 'file': f'{site}.html'}], 'scripts': []}
+    return {
+        'target_date': date.today().isoformat(), 'window_days': 0, 'http_fast_path': False,
+        'sources': sources, 'http': [], 'pages': pages, 'bodies': {},
+    }
+
+def make_alerts(count):
+    """Alerts shaped like the scrapers' output, spread over every agency"""
+    return [
+        {
+            'agency': SITES[i % len(SITES)],
+            'company': company,
+            'date': render_date(day, SITES[i % len(SITES)]),
+            'action': action,
+            'timestamp': day.isoformat(),
+            'sources': [SITES[i % len(SITES)], SITES[(i + 1) % len(SITES)]] if i % 5 == 0 else [SITES[i % len(SITES)]],
+        }
+        for i, (day, company, action) in enumerate(make_rows(count))
+    ]
+
+def bench_parsing(results, rows, repeat):
+    for site in SITES:
+        html = site_page(site, make_rows(rows, today_share=TODAY_SHARE))
+        seconds, peak, _ = measure(lambda: parse_html(html, site), repeat)
+        results[f'parse/{site}/{rows}'] = {'rows': rows, 'seconds': seconds, 'peak_bytes': peak}
+
+def bench_extraction(results, system, rows, repeat):
+    soup = BeautifulSoup(make_row_html(rows), 'lxml')
+    elements = soup.find_all('tr', class_='gridrow') + soup.find_all('div', class_=['rating-item', 'rating-card', 'announcement-item'])
+    for site, plan in FIELD_PLANS.items():
+        def extract():
+            return [
+                [system.extract_text_from_element(element, selectors) for selectors in plan.fields.values()]
+                for element in elements
+            ]
+        seconds, peak, _ = measure(extract, repeat)
+        results[f'extract/{site}/{rows}'] = {'rows': len(elements), 'seconds': seconds, 'peak_bytes': peak}
+
+def bench_dates(results, system, rows, repeat):
+    texts = [render_date(day, SITES[i % len(SITES)]) for i, (day, _, _) in enumerate(make_rows(rows, today_share=TODAY_SHARE))]
+    seconds, peak, _ = measure(lambda: [system.is_today_date(text) for text in texts], repeat)
+    results[f'is_today_date/{rows}'] = {'rows': rows, 'seconds': seconds, 'peak_bytes': peak}
+
+def bench_scrapers(results, corpus, label, repeat):
+    """Time each scraper over a replay corpus; the row loop is its time minus page loads, waits and parsing"""
+    with tempfile.TemporaryDirectory() as workdir:
+        system = ReplaySystem(
+            corpus,
+            target_date=date.fromisoformat(corpus['target_date']),
+            window_days=corpus['window_days'],
+            http_fast_path=corpus['http_fast_path'],
+            **isolated_paths(workdir),
+        )
+        try:
+            for site in corpus['sources']:
+                scraper = system.source_scraper(load_source(site))
+                
+                loop_times = []
+                
+                def scrape():
+                    system.begin_sweep()
+                    start = time.perf_counter()
+                    system.run_scraper(site, scraper)
+                    values = system.metrics.run.get(site, {})
+                    overhead = sum(values.get(name, 0) for name in ('page_load_seconds', 'wait_seconds', 'parse_seconds'))
+                    loop_times.append(time.perf_counter() - start - overhead)
+                    return values.get('rows_scanned', 0)
+                
+                seconds, peak, rows = measure(scrape, repeat)
+                results[f'scrape/{site}/{label}'] = {
+                    'rows': rows,
+                    'seconds': seconds,
+                    'loop_seconds': max(min(loop_times[:repeat]), 0.0),
+                    'peak_bytes': peak,
+                }
+        finally:
+            system.cleanup()
+
+def bench_alerts(results, rows, repeat):
+    fields = [(site, company, render_date(day, site), action) for (day, company, action), site in zip(make_rows(rows), SITES * rows)]
+    timestamp = datetime.now().isoformat()
+    seconds, peak, _ = measure(lambda: [Alert(*values, timestamp) for values in fields], repeat)
+    results[f'alerts/{rows}'] = {'rows': rows, 'seconds': seconds, 'peak_bytes': peak}
+
+def bench_report(results, system, rows, repeat):
+    alerts = make_alerts(rows)
+    seconds, peak, _ = measure(lambda: system.generate_alert_report(alerts), repeat)
+    results[f'report/{rows}'] = {'rows': rows, 'seconds': seconds, 'peak_bytes': peak}
+
+def compare(results, baseline, tolerance):
+    """Descriptions of every case that regressed against the baseline"""
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        if result['seconds'] > max(base['seconds'], MIN_COMPARED_SECONDS) * (1 + tolerance):
+            regressions.append(f"{case}: {result['seconds'] * 1000:.1f} ms vs {base['seconds'] * 1000:.1f} ms baseline")
+        if result['peak_bytes'] > base['peak_bytes'] * (1 + tolerance):
+            regressions.append(f"{case}: peak {result['peak_bytes'] / 2**20:.1f} MiB vs {base['peak_bytes'] / 2**20:.1f} MiB baseline")
+    return regressions
+
+def print_results(results, baseline):
+    print(f"{'case':<28} {'rows':>7} {'ms':>10} {'loop ms':>9} {'rows/s':>11} {'peak MiB':>9} {'vs base':>8}")
+    for case, result in results.items():
+        base = baseline.get(case)
+        change = f"{(result['seconds'] / base['seconds'] - 1) * 100:>+7.0f}%" if base and base['seconds'] else f"{'-':>8}"
+        loop = f"{result['loop_seconds'] * 1000:>9.1f}" if 'loop_seconds' in result else f"{'-':>9}"
+        throughput = result['rows'] / result['seconds'] if result['seconds'] else 0
+        print(
+            f"{case:<28} {result['rows']:>7} {result['seconds'] * 1000:>10.1f} {loop} "
+            f"{throughput:>11.0f} {result['peak_bytes'] / 2**20:>9.1f} {change}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma-separated synthetic row counts')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--corpus', help='recorded corpus directory to replay as well')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown or memory growth')
+    args = parser.parse_args()
+    
+    # Synthetic pages lack some of the live sites' filters and tabs, which
+    # the scrapers log as warnings
+    logging.getLogger().setLevel(logging.ERROR)
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        system = ReplaySystem(synthetic_corpus(0), **isolated_paths(workdir))
+        try:
+            for rows in map(int, args.sizes.split(',')):
+                bench_parsing(results, rows, args.repeat)
+                bench_extraction(results, system, rows, args.repeat)
+                bench_dates(results, system, rows, args.repeat)
+                bench_scrapers(results, synthetic_corpus(rows), rows, args.repeat)
+                bench_alerts(results, rows, args.repeat)
+                bench_report(results, system, rows, args.repeat)
+        finally:
+            system.cleanup()
+    if args.corpus:
+        bench_scrapers(results, load_corpus(args.corpus), 'recorded', args.repeat)
+    
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            saved = json.load(f)
+        baseline = saved['cases']
+        if saved.get('machine') != platform.node():
+            print(f"Baseline was saved on {saved.get('machine')}; timings may not be comparable")
+    print_results(results, baseline)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'machine': platform.node(),
+                'python': platform.python_version(),
+                'cases': {**baseline, **results},
+            }, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,506 @@
+"""Record live scraper sessions into a fixture corpus and replay them offline
+
+Usage:
+    python benchmarks/fixtures.py record DIR [--browser-only]
+    python benchmarks/fixtures.py replay DIR [--repeat N]
+
+Recording runs one full sweep against the live sites. Every page_source the
+scrapers read (one per pagination step, scroll or tab), every script result
+such as scroll heights, and every HTTP fast-path response is saved under DIR
+with a manifest.json. Replaying runs the same scrapers against a ReplayDriver
+and replay-mounted HTTP sessions, so no browser or network is needed and every
+run sees identical input. --browser-only records the Selenium paths of the
+sources that normally go over HTTP.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+from lxml import html as lxml_html
+from requests.adapters import BaseAdapter
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app import SITE_READINESS, RatingAgencyAlertSystem, current_source
+
+# Bumped whenever the manifest layout changes
+FIXTURE_FORMAT = 1
+
+# Locators of loading indicators; a recording is taken after they cleared,
+# so during replay they are never displayed
+SPINNER_LOCATORS = {readiness.spinner for readiness in SITE_READINESS.values() if readiness.spinner}
+
+CSS_COMPOUND = re.compile(r'([#.][\w-]+|\[[^\]]+\]|^[\w*-]+)')
+CSS_ATTRIBUTE = re.compile(r'\[\s*([\w-]+)\s*(?:([*^]?=)\s*["\']?([^"\'\]]*)["\']?)?\s*\]')
+
+def css_to_xpath(selector, relative=False):
+    """XPath for the CSS subset the scrapers use: tags, #id, .class, [attr], [attr=v], [attr*=v], [attr^=v] and descendants"""
+    groups = []
+    for group in selector.split(','):
+        steps = []
+        for compound in group.split():
+            tag = '*'
+            predicates = []
+            for part in CSS_COMPOUND.findall(compound):
+                if part.startswith('#'):
+                    predicates.append(f"@id='{part[1:]}'")
+                elif part.startswith('.'):
+                    predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {part[1:]} ')")
+                elif part.startswith('['):
+                    name, op, value = CSS_ATTRIBUTE.match(part).groups()
+                    if not op:
+                        predicates.append(f"@{name}")
+                    elif op == '=':
+                        predicates.append(f"@{name}='{value}'")
+                    elif op == '*=':
+                        predicates.append(f"contains(@{name}, '{value}')")
+                    else:
+                        predicates.append(f"starts-with(@{name}, '{value}')")
+                else:
+                    tag = part
+            steps.append(tag + ''.join(f'[{predicate}]' for predicate in predicates))
+        groups.append(('.//' if relative else '//') + '//'.join(steps))
+    return ' | '.join(groups)
+
+def locator_xpath(by, value, relative=False):
+    """XPath equivalent of a Selenium locator"""
+    prefix = './/' if relative else '//'
+    if by == By.XPATH:
+        return value
+    if by == By.ID:
+        return f"{prefix}*[@id='{value}']"
+    if by == By.NAME:
+        return f"{prefix}*[@name='{value}']"
+    if by == By.CLASS_NAME:
+        return f"{prefix}*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+    if by == By.TAG_NAME:
+        return f"{prefix}{value}"
+    if by == By.CSS_SELECTOR:
+        return css_to_xpath(value, relative)
+    raise ValueError(f"Unsupported locator strategy {by}")
+
+class Recorder:
+    """Collects one sweep's page snapshots, script results and HTTP responses per source"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.sources = {}
+        self.http = []
+        os.makedirs(directory, exist_ok=True)
+
+    def source(self):
+        """Recording of the source being scraped on this thread"""
+        name = current_source.get() or 'other'
+        return name, self.sources.setdefault(name, {'ordinal': -1, 'snapshots': [], 'scripts': []})
+
+    def action(self):
+        """Note a navigation, click or scroll; snapshots and script results taken after it belong to it"""
+        _, recording = self.source()
+        recording['ordinal'] += 1
+
+    def snapshot(self, html):
+        """Save a page source read by a scraper"""
+        name, recording = self.source()
+        snapshots = recording['snapshots']
+        if snapshots and snapshots[-1]['ordinal'] == recording['ordinal'] and snapshots[-1]['html'] == html:
+            return
+        filename = os.path.join(name, f"{len(snapshots):03d}.html")
+        os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+        with open(os.path.join(self.directory, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+        snapshots.append({'ordinal': recording['ordinal'], 'file': filename, 'html': html})
+
+    def script(self, script, args, result):
+        """Save the result of a script a scraper ran"""
+        _, recording = self.source()
+        recording['scripts'].append({'ordinal': recording['ordinal'], 'script': script, 'args': list(args), 'result': result})
+
+    def response(self, response, *args, **kwargs):
+        """requests response hook saving an HTTP fast-path response"""
+        request = response.request
+        filename = os.path.join('http', f"{len(self.http):03d}.body")
+        os.makedirs(os.path.join(self.directory, 'http'), exist_ok=True)
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            f.write(response.content)
+        self.http.append({
+            'method': request.method,
+            'url': request.url,
+            'body': request_body(request),
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', ''),
+            'file': filename,
+        })
+
+    def save(self, system):
+        """Write the manifest describing the corpus"""
+        sources = {
+            name: {
+                'snapshots': [{'ordinal': snapshot['ordinal'], 'file': snapshot['file']} for snapshot in recording['snapshots']],
+                'scripts': recording['scripts'],
+            }
+            for name, recording in self.sources.items()
+        }
+        manifest = {
+            'format': FIXTURE_FORMAT,
+            'recorded_at': datetime.now().isoformat(),
+            'target_date': system.date_matcher.end.isoformat(),
+            'window_days': system.window_days,
+            'http_fast_path': system.http_fast_path,
+            'sources': sources,
+            'http': self.http,
+        }
+        with open(os.path.join(self.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+def request_body(request):
+    """A prepared request's body as text, for matching replayed requests"""
+    body = request.body or ''
+    return body.decode('utf-8') if isinstance(body, bytes) else body
+
+class RecordingElement:
+    """WebElement proxy that records clicks as actions"""
+    def __init__(self, element, recorder):
+        self._element = element
+        self._recorder = recorder
+
+    def click(self):
+        self._element.click()
+        self._recorder.action()
+
+    def find_element(self, by, value):
+        return RecordingElement(self._element.find_element(by, value), self._recorder)
+
+    def find_elements(self, by, value):
+        return [RecordingElement(element, self._recorder) for element in self._element.find_elements(by, value)]
+
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+class RecordingDriver:
+    """WebDriver proxy that feeds a Recorder while the scrapers use the real browser"""
+    def __init__(self, driver, recorder):
+        self._driver = driver
+        self._recorder = recorder
+
+    def get(self, url):
+        self._driver.get(url)
+        self._recorder.action()
+
+    @property
+    def page_source(self):
+        html = self._driver.page_source
+        self._recorder.snapshot(html)
+        return html
+
+    def execute_script(self, script, *args):
+        result = self._driver.execute_script(script, *args)
+        if script.lstrip().startswith('return'):
+            self._recorder.script(script, args, result)
+        else:
+            self._recorder.action()
+        return result
+
+    def find_element(self, by, value):
+        return RecordingElement(self._driver.find_element(by, value), self._recorder)
+
+    def find_elements(self, by, value):
+        return [RecordingElement(element, self._recorder) for element in self._driver.find_elements(by, value)]
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+class RecordingSystem(RatingAgencyAlertSystem):
+    """Alert system whose drivers and HTTP sessions record into a corpus"""
+    def __init__(self, recorder, **kwargs):
+        self.recorder = recorder
+        super().__init__(**kwargs)
+
+    def create_driver(self):
+        driver = super().create_driver()
+        return RecordingDriver(driver, self.recorder) if driver else None
+
+    def get_http_session(self, source):
+        session = super().get_http_session(source)
+        if self.recorder.response not in session.hooks['response']:
+            session.hooks['response'].append(self.recorder.response)
+        return session
+
+class ReplayElement:
+    """Static element of a replayed snapshot; goes stale once the page moves on"""
+    def __init__(self, driver, node, generation, displayed=True):
+        self._driver = driver
+        self._node = node
+        self._generation = generation
+        self._displayed = displayed
+
+    def _check(self):
+        if self._driver.generation() != self._generation:
+            raise StaleElementReferenceException("Replayed page has changed")
+
+    @property
+    def text(self):
+        self._check()
+        return ' '.join(self._node.text_content().split())
+
+    def get_attribute(self, name):
+        self._check()
+        return self._node.get(name)
+
+    def is_displayed(self):
+        self._check()
+        return self._displayed and 'display:none' not in (self._node.get('style') or '').replace(' ', '')
+
+    def is_enabled(self):
+        self._check()
+        return self._node.get('disabled') is None
+
+    def clear(self):
+        self._check()
+
+    def send_keys(self, *keys):
+        self._check()
+
+    def click(self):
+        self._check()
+        self._driver.action()
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    def find_elements(self, by, value):
+        self._check()
+        return [ReplayElement(self._driver, node, self._generation) for node in self._node.xpath(locator_xpath(by, value, relative=True))]
+
+class ReplayDriver:
+    """Fake WebDriver serving a corpus: navigations, clicks and scrolls step through the recorded snapshots"""
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.positions = {}
+        self.trees = {}
+
+    def source(self):
+        name = current_source.get() or 'other'
+        return self.corpus['sources'].get(name, {'snapshots': [], 'scripts': []}), name
+
+    def action(self):
+        """Advance the current source's recording by one navigation, click or scroll"""
+        _, name = self.source()
+        self.positions[name] = self.positions.get(name, -1) + 1
+
+    def ordinal(self):
+        _, name = self.source()
+        return self.positions.get(name, -1)
+
+    def snapshot_index(self):
+        """Index of the snapshot the page is in: the first taken at or after the current action"""
+        recording, _ = self.source()
+        snapshots = recording['snapshots']
+        ordinal = self.ordinal()
+        for index, snapshot in enumerate(snapshots):
+            if snapshot['ordinal'] >= ordinal:
+                return index
+        return len(snapshots) - 1
+
+    def generation(self):
+        _, name = self.source()
+        return (name, self.snapshot_index())
+
+    def get(self, url):
+        _, name = self.source()
+        # Every scraper starts its source from the first recorded page
+        self.positions[name] = 0
+
+    @property
+    def page_source(self):
+        recording, _ = self.source()
+        index = self.snapshot_index()
+        if index < 0:
+            return '<html><body></body></html>'
+        return self.corpus['pages'][recording['snapshots'][index]['file']]
+
+    def tree(self):
+        html = self.page_source
+        tree = self.trees.get(html)
+        if tree is None:
+            tree = self.trees[html] = lxml_html.fromstring(html)
+        return tree
+
+    def execute_script(self, script, *args):
+        if not script.lstrip().startswith('return'):
+            self.action()
+            return None
+        if script.strip() == "return document.readyState":
+            return 'complete'
+        recording, _ = self.source()
+        ordinal = self.ordinal()
+        result = None
+        for entry in recording['scripts']:
+            if entry['script'] == script and entry['args'] == list(args) and entry['ordinal'] <= ordinal:
+                result = entry['result']
+        return result
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    def find_elements(self, by, value):
+        displayed = (by, value) not in SPINNER_LOCATORS
+        generation = self.generation()
+        return [ReplayElement(self, node, generation, displayed) for node in self.tree().xpath(locator_xpath(by, value))]
+
+    def quit(self):
+        pass
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport answering from recorded HTTP responses, 404 for anything unrecorded"""
+    def __init__(self, corpus):
+        super().__init__()
+        self.responses = {}
+        for entry in corpus['http']:
+            self.responses.setdefault((entry['method'], entry['url'], entry['body']), entry)
+        self.corpus = corpus
+
+    def send(self, request, **kwargs):
+        entry = self.responses.get((request.method, request.url, request_body(request)))
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if entry is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+        response.status_code = entry['status']
+        response.headers['Content-Type'] = entry['content_type']
+        response._content = self.corpus['bodies'][entry['file']]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+class ReplaySystem(RatingAgencyAlertSystem):
+    """Alert system running every scraper against a recorded corpus"""
+    def __init__(self, corpus, **kwargs):
+        self.corpus = corpus
+        super().__init__(**kwargs)
+
+    def create_driver(self):
+        return ReplayDriver(self.corpus)
+
+    def get_http_session(self, source):
+        session = super().get_http_session(source)
+        if not isinstance(session.get_adapter('https://'), ReplayAdapter):
+            adapter = ReplayAdapter(self.corpus)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+
+    def bind_driver(self, driver):
+        # Scrapers waiting on self.wait directly get the same single check
+        super().bind_driver(driver)
+        if driver:
+            self._local.wait = WebDriverWait(driver, 0, poll_frequency=0.01)
+
+    def wait_for(self, site, condition, timeout=None):
+        # A replayed page only changes on an action, so one check is final
+        try:
+            ready = bool(condition(self.driver))
+        except (NoSuchElementException, StaleElementReferenceException):
+            ready = False
+        self.record_wait(site, 0.0, not ready)
+        return ready
+
+def load_corpus(directory):
+    """Manifest plus every recorded page and response body of a corpus"""
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        corpus = json.load(f)
+    if corpus.get('format') != FIXTURE_FORMAT:
+        raise ValueError(f"{directory} has fixture format {corpus.get('format')}, expected {FIXTURE_FORMAT}")
+    corpus['pages'] = {}
+    for recording in corpus['sources'].values():
+        for snapshot in recording['snapshots']:
+            with open(os.path.join(directory, snapshot['file']), encoding='utf-8') as f:
+                corpus['pages'][snapshot['file']] = f.read()
+    corpus['bodies'] = {}
+    for entry in corpus['http']:
+        with open(os.path.join(directory, entry['file']), 'rb') as f:
+            corpus['bodies'][entry['file']] = f.read()
+    return corpus
+
+def isolated_paths(workdir):
+    """Constructor arguments keeping a fixture run's state, database and exports out of the working directory"""
+    return {
+        'incremental': False,
+        'state_path': os.path.join(workdir, 'state.json'),
+        'alert_db_path': os.path.join(workdir, 'alerts.db'),
+        'stream_dir': None,
+        'archive_dir': None,
+        'metrics_path': None,
+        'watchlist_path': None,
+        'entities_path': None,
+    }
+
+def record(directory, browser_only=False):
+    """Run one live sweep and save it as a corpus"""
+    recorder = Recorder(directory)
+    with tempfile.TemporaryDirectory() as workdir:
+        system = RecordingSystem(recorder, http_fast_path=not browser_only, **isolated_paths(workdir))
+        try:
+            alerts = system.run_all_scrapers()
+            recorder.save(system)
+        finally:
+            system.cleanup()
+    print(f"Recorded {len(alerts)} alerts into {directory}")
+
+def replay(directory, repeat=1, **kwargs):
+    """Run the scrapers over a corpus; returns the last run's alerts and the system's metrics"""
+    corpus = load_corpus(directory)
+    with tempfile.TemporaryDirectory() as workdir:
+        system = ReplaySystem(
+            corpus,
+            target_date=date.fromisoformat(corpus['target_date']),
+            window_days=corpus['window_days'],
+            http_fast_path=corpus['http_fast_path'],
+            **{**isolated_paths(workdir), **kwargs},
+        )
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                alerts = system.run_all_scrapers()
+                print(f"Replayed {len(alerts)} alerts in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return alerts, system.metrics
+        finally:
+            system.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    record_parser = commands.add_parser('record', help='record a live sweep')
+    record_parser.add_argument('directory')
+    record_parser.add_argument('--browser-only', action='store_true', help='skip the HTTP fast paths')
+    replay_parser = commands.add_parser('replay', help='replay a recorded sweep')
+    replay_parser.add_argument('directory')
+    replay_parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    
+    if args.command == 'record':
+        record(args.directory, args.browser_only)
+    else:
+        _, metrics = replay(args.directory, args.repeat)
+        print(metrics.summary_table())
+
+if __name__ == '__main__':
+    main()
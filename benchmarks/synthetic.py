@@ -0,0 +1,82 @@
+"""Synthetic agency pages shaped like the live sites, for offline benchmarks"""
+import random
+from datetime import datetime, timedelta
+
+SITES = ['ICRA', 'CareEdge', 'Acuite', 'CRISIL', 'BSE', 'NSE', 'SEBI']
+
+COMPANIES = [
+    'Bajaj Finance Limited', 'Shriram Finance Ltd', 'Cholamandalam Investment and Finance Company Ltd',
+    'Muthoot Finance Limited', 'Mahindra & Mahindra Financial Services Ltd', 'L&T Finance Limited',
+    'Aditya Birla Capital Ltd', 'Tata Capital Limited', 'Poonawalla Fincorp Limited', 'Manappuram Finance Ltd',
+    'IIFL Finance Limited', 'Sundaram Finance Limited', 'HDB Financial Services Ltd', 'Piramal Capital & Housing Finance',
+]
+
+ACTIONS = [
+    'Rating reaffirmed at [ICRA]AA+ (Stable)', 'Upgraded to CARE AA; Stable', 'Downgraded to ACUITE A-',
+    'CRISIL AAA/Stable assigned', 'Credit Rating', 'Outlook revised to Positive', 'Rating withdrawn',
+    'Placed on Rating Watch with Negative Implications',
+]
+
+def render_date(day, style):
+    """Render a date the way the given site shows it"""
+    return {
+        'ICRA': day.strftime('%d %b %Y'),
+        'CareEdge': day.strftime('%d %B %Y'),
+        'Acuite': day.strftime('%d-%m-%Y'),
+        'CRISIL': day.strftime('%B %d, %Y').replace(' 0', ' '),
+        'BSE': day.strftime('%d/%m/%Y'),
+        'NSE': day.strftime('%d-%b-%Y %H:%M:%S'),
+        'SEBI': day.strftime('%b %d, %Y'),
+    }[style]
+
+def boilerplate(links=300, scripts=20):
+    """Navigation, scripts and footer markup that surrounds the data on real pages"""
+    nav = ''.join(f'<li class="nav-item"><a href="/section/{i}"><span class="icon"></span>Section {i}</a></li>' for i in range(links))
+    js = ''.join(f'<script>window.__data{i} = {{"k": "{"x" * 200}"}};</script>' for i in range(scripts))
+    footer = ''.join(f'<div class="footer-col"><p>Disclaimer paragraph {i} {"lorem ipsum " * 20}</p></div>' for i in range(links // 10))
+    return f'<header><nav><ul>{nav}</ul></nav></header>{js}', f'<footer>{footer}</footer>'
+
+def make_rows(count, today=None, today_share=0.2, seed=0):
+    """(date, company, action) tuples, newest first, with today_share of them dated today"""
+    rng = random.Random(seed)
+    today = today or datetime.now()
+    rows = []
+    for i in range(count):
+        age = 0 if i < count * today_share else 1 + (i * 3) // max(count, 1)
+        rows.append((today - timedelta(days=age), rng.choice(COMPANIES), rng.choice(ACTIONS)))
+    return rows
+
+def site_page(site, rows, has_next=False):
+    """Full HTML page for a site containing the given rows"""
+    head, foot = boilerplate()
+    if site == 'ICRA':
+        body = ''.join(
+            f'<tr class="gridrow"><td><span class="company-name">{c}</span></td>'
+            f'<td><span class="rating-date">{render_date(d, site)}</span></td>'
+            f'<td><span class="rating-action">{a}</span></td></tr>'
+            for d, c, a in rows
+        )
+        data = f'<table id="grdRating"><tr class="gridheader"><th>Company</th><th>Date</th><th>Action</th></tr>{body}</table>'
+    elif site in ('CareEdge', 'CRISIL'):
+        item_class = 'rating-item' if site == 'CareEdge' else 'rating-card'
+        body = ''.join(
+            f'<div class="{item_class}"><h4 class="entity-name">{c}</h4>'
+            f'<span class="date">{render_date(d, site)}</span>'
+            f'<p class="rating-action">{a}</p></div>'
+            for d, c, a in rows
+        )
+        data = f'<div class="recent-ratings">{body}</div>'
+    elif site in ('Acuite', 'SEBI'):
+        cells = (lambda d, c, a: f'<td>{render_date(d, site)}</td><td>{c}</td><td>{a}</td>') if site == 'Acuite' \
+            else (lambda d, c, a: f'<td>{render_date(d, site)}</td><td><a href="/x">{c}: {a}</a></td>')
+        body = ''.join(f'<tr>{cells(d, c, a)}</tr>' for d, c, a in rows)
+        data = f'<table class="table"><tr><th>Date</th><th>Title</th><th>Rating</th></tr>{body}</table>'
+    else:
+        body = ''.join(
+            f'<tr><td>{render_date(d, site)}</td><td>{c}</td><td>{a}</td><td><a href="/att.pdf">PDF</a></td></tr>'
+            for d, c, a in rows
+        )
+        data = f'<table class="common_table"><tr><th>Date</th><th>Company</th><th>Subject</th><th>Attachment</th></tr>{body}</table>'
+    pager = '<a class="next" href="#">Next</a>' if has_next else ''
+    tabs = '<ul class="tabs"><li><a href="#equity">Equity</a></li><li><a href="#debt">Debt</a></li></ul>' if site == 'NSE' else ''
+    return f'<!DOCTYPE html><html><head><title>{site}</title></head><body>{head}<main>{tabs}{data}{pager}</main>{foot}</body></html>'
@@ -0,0 +1,14 @@
+"""Source plugins loaded on demand from app.SOURCE_REGISTRY
+
+Each module defines SOURCE, an app.SourceConfig naming the listing URL, its
+date filter, segments, pagination, row selector and field map, plus the
+readiness check and strainer the shared page helpers need. The generic
+app.SourceScraper runs the listing unless the config names a hooks subclass
+overriding single steps. A plugin module is only imported the first time a
+sweep looks at its source, so adding one costs the other sources nothing;
+register it with a LazySource('sources.<module>:SOURCE') entry in
+SOURCE_REGISTRY, or app.register_source(). The entry, not the module, says
+whether the source is enabled: new sources should be registered with
+enabled=False, so only sweeps naming them run them, until a recorded fixture
+has confirmed their selectors.
+"""
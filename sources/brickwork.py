@@ -0,0 +1,24 @@
+"""Brickwork Ratings press releases"""
+from bs4 import SoupStrainer
+from selenium.webdriver.common.by import By
+
+from app import SiteReadiness, SourceConfig
+
+SOURCE = SourceConfig(
+    'Brickwork', "https://www.brickworkratings.com/CreditRatings.aspx",
+    pagination='load_more',
+    next_button=(By.XPATH, "//button[contains(text(), 'Load More')] | //a[contains(text(), 'Load More')]"),
+    rows=[('div', ['rating-item', 'press-release'])],
+    fields={
+        'company': ['company', 'entity', 'name'],
+        'date': ['date', 'released'],
+        'action': ['action', 'rating'],
+    },
+    readiness=SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'div.rating-item, div.press-release'),
+        spinner=(By.CSS_SELECTOR, '.loading, .spinner'),
+        timeout=20,
+        settle_timeout=3,
+    ),
+    strainer=SoupStrainer('div', class_=['rating-item', 'press-release']),
+)
@@ -0,0 +1,22 @@
+"""India Ratings and Research rating actions"""
+from bs4 import SoupStrainer
+from selenium.webdriver.common.by import By
+
+from app import SiteReadiness, SourceConfig
+
+SOURCE = SourceConfig(
+    'India Ratings', "https://www.indiaratings.co.in/rating-actions",
+    date_fields=((By.ID, "fromDate"), (By.ID, "toDate")),
+    date_format='dd-mm-yyyy',
+    submit=(By.XPATH, "//button[contains(text(), 'Search')]"),
+    pagination='next',
+    next_button=(By.XPATH, "//a[contains(text(), 'Next')] | //li[contains(@class, 'next')]/a"),
+    rows=[('tr', None)],
+    columns={'date': 0, 'company': 1, 'action': 2},
+    readiness=SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'table tbody tr'),
+        spinner=(By.CSS_SELECTOR, '.loader, .spinner'),
+        timeout=20,
+    ),
+    strainer=SoupStrainer('table'),
+)
@@ -0,0 +1,37 @@
+"""Infomerics Valuation and Rating press releases"""
+import re
+
+from bs4 import SoupStrainer
+from selenium.webdriver.common.by import By
+
+from app import FIELD_PLANS, SiteReadiness, SourceConfig, SourceScraper
+
+# Press release titles read "<company>: <rating action>" or "<company> - <rating action>"
+TITLE_SEPARATOR = re.compile(r'\s*:\s*|\s+[-–]\s+')
+
+class InfomericsScraper(SourceScraper):
+    """Takes the company and action from the press release title"""
+    def read_row(self, row):
+        fields = FIELD_PLANS[self.config.name].extract(row)
+        parts = TITLE_SEPARATOR.split(fields['title'], maxsplit=1)
+        if len(parts) < 2:
+            return None
+        return {'company': parts[0], 'date': fields['date'], 'action': parts[1]}
+
+SOURCE = SourceConfig(
+    'Infomerics', "https://www.infomerics.com/latest-press-release",
+    hooks=InfomericsScraper,
+    pagination='next',
+    next_button=(By.XPATH, "//a[@rel='next'] | //a[contains(text(), 'Next')]"),
+    rows=[('div', ['press-release', 'release-item'])],
+    fields={
+        'title': ['title', 'heading'],
+        'date': ['date', 'published'],
+    },
+    readiness=SiteReadiness(
+        rows=(By.CSS_SELECTOR, 'div.press-release, div.release-item'),
+        spinner=(By.CSS_SELECTOR, '.loader'),
+        timeout=20,
+    ),
+    strainer=SoupStrainer('div', class_=['press-release', 'release-item']),
+)
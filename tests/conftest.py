@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+# The replay tests drive the scrapers with the benchmarks' recorded-corpus fixtures
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from app import RatingAgencyAlertSystem
+
+@pytest.fixture
+def alert_system(tmp_path):
+    """Alert system whose database and state live in tmp_path, with every export switched off"""
+    system = RatingAgencyAlertSystem(
+        incremental=False,
+        state_path=str(tmp_path / 'state.json'),
+        alert_db_path=str(tmp_path / 'alerts.db'),
+        stream_dir=None,
+        archive_dir=None,
+        metrics_path=None,
+        watchlist_path=None,
+        entities_path=None,
+    )
+    yield system
+    system.alert_store.conn.close()
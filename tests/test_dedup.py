@@ -0,0 +1,90 @@
+from app import Alert, AlertPipeline
+
+COMPANY = 'Acme Finance Ltd'
+DAY = '15-10-2026'
+
+def alert(agency, action, company=COMPANY, date=DAY):
+    return Alert(agency, company, date, action, '2026-10-15T10:00:00')
+
+def sweep(system, *batches):
+    """Run batches through one sweep's pipeline; returns its events and the events handed to handlers"""
+    notified = []
+    system.event_handlers = [notified.extend]
+    pipeline = AlertPipeline(system)
+    for batch in batches:
+        pipeline.feed(batch)
+    events = pipeline.close()
+    return events, notified
+
+def headlines(events):
+    return sorted((event['agency'], event['action']) for event in events)
+
+def test_exchange_notices_stay_apart_from_rating_events(alert_system):
+    events, notified = sweep(
+        alert_system,
+        [alert('BSE (Equity)', 'Outcome of Board Meeting'),
+         alert('BSE (Equity)', 'Credit Rating'),
+         alert('BSE (Equity)', 'Intimation of Record Date for Dividend')],
+        [alert('ICRA', 'Rating downgraded to [ICRA]AA'),
+         alert('ICRA', 'Rating reaffirmed at [ICRA]A1+')],
+    )
+    assert headlines(events) == [
+        ('BSE (Equity)', 'Intimation of Record Date for Dividend'),
+        ('BSE (Equity)', 'Outcome of Board Meeting'),
+        ('ICRA', 'Rating downgraded to [ICRA]AA'),
+        ('ICRA', 'Rating reaffirmed at [ICRA]A1+'),
+    ]
+    downgrade = next(event for event in events if 'downgraded' in event['action'])
+    assert downgrade['sources'] == ['ICRA', 'BSE (Equity)']
+    assert all(event['new'] for event in events)
+    assert headlines(notified) == [
+        ('BSE (Equity)', 'Credit Rating'),
+        ('BSE (Equity)', 'Intimation of Record Date for Dividend'),
+        ('BSE (Equity)', 'Outcome of Board Meeting'),
+        ('ICRA', 'Rating downgraded to [ICRA]AA'),
+        ('ICRA', 'Rating reaffirmed at [ICRA]A1+'),
+    ]
+
+def test_specific_agency_actions_are_never_folded_together(alert_system):
+    events, _ = sweep(alert_system, [
+        alert('ICRA', 'Rating reaffirmed'),
+        alert('CRISIL', 'Downgraded to CRISIL AA'),
+        alert('CareEdge', 'Upgraded to CARE AAA'),
+    ])
+    assert headlines(events) == [
+        ('CRISIL', 'Downgraded to CRISIL AA'),
+        ('CareEdge', 'Upgraded to CARE AAA'),
+        ('ICRA', 'Rating reaffirmed'),
+    ]
+
+def test_agency_action_taking_over_a_stored_placeholder_is_notified(alert_system):
+    events, notified = sweep(alert_system, [alert('BSE (Debt)', 'Credit Rating')])
+    assert [event['new'] for event in events] == [True]
+    
+    events, notified = sweep(alert_system, [alert('ICRA', 'Rating downgraded to [ICRA]AA')])
+    assert headlines(events) == [('ICRA', 'Rating downgraded to [ICRA]AA')]
+    assert events[0]['sources'] == ['ICRA', 'BSE (Debt)']
+    assert events[0]['new'] is True
+    assert headlines(notified) == [('ICRA', 'Rating downgraded to [ICRA]AA')]
+
+def test_board_meeting_notice_does_not_swallow_a_later_agency_action(alert_system):
+    sweep(alert_system, [alert('BSE (Equity)', 'Outcome of Board Meeting')])
+    events, notified = sweep(alert_system, [alert('ICRA', 'Rating downgraded to [ICRA]AA')])
+    assert headlines(notified) == [('ICRA', 'Rating downgraded to [ICRA]AA')]
+    assert events[0]['sources'] == ['ICRA']
+
+def test_exchange_disclosure_of_a_recorded_action_is_not_notified_again(alert_system):
+    sweep(alert_system, [alert('ICRA', 'Upgraded to [ICRA]AA+')])
+    events, notified = sweep(alert_system, [alert('BSE (Debt)', 'Credit Rating')])
+    assert notified == []
+    assert events[0]['agency'] == 'ICRA'
+    assert events[0]['sources'] == ['ICRA', 'BSE (Debt)']
+    assert events[0]['new'] is False
+
+def test_same_notice_in_both_exchange_segments_is_one_event(alert_system):
+    events, notified = sweep(alert_system, [
+        alert('NSE (Equity)', 'Outcome of Board Meeting'),
+        alert('NSE (Debt)', 'Outcome of Board Meeting'),
+    ])
+    assert len(events) == 1 and len(notified) == 1
+    assert events[0]['sources'] == ['NSE (Equity)', 'NSE (Debt)']